@@ -0,0 +1,26 @@
+import io
+import os
+from typing import Optional
+
+from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from pypdf import PdfReader
+
+def extract_text(file_path: str, data: Optional[bytes] = None) -> str:
+    """Extract a document's text, from ``data`` if given, else from ``file_path``.
+
+    Ingestion and content verification both read documents through this
+    function, so the two sides always see the same text.
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+
+    if data is not None and file_extension == '.pdf':
+        reader = PdfReader(io.BytesIO(data))
+        return "\n".join(page.extract_text() for page in reader.pages)
+    if data is not None and file_extension == '.txt':
+        return data.decode('utf-8')
+    if file_extension == '.pdf':
+        pages = PyPDFLoader(file_path).load()
+        return "\n".join(page.page_content for page in pages)
+    if file_extension == '.txt':
+        return TextLoader(file_path).load()[0].page_content
+    raise ValueError(f"Unsupported file type: {file_extension}")
@@ -1,10 +1,8 @@
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 import os
 from pathlib import Path
 import uuid
 from datetime import datetime, date
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.prompts import PromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 import json
@@ -14,9 +12,11 @@ import re
 
 from ..models.domain import (
     LegalCase, SourceDocument, DocumentChunk, WorkItem, Disbursement, FeeEarner, Party,
-    DocumentType, ActivityType, DisbursementType
+    DocumentType, ActivityType, WorkActivityType, DisbursementType,
+    ACTIVITY_TYPES_STR, DISBURSEMENT_TYPES_STR
 )
-from ..llm.operations import LLMOperations
+from ..llm.operations import get_llm_operations
+from .loaders import extract_text
 from ..graph.operations import Neo4jGraph
 from src.config import DEFAULT_FIRM_ID, DEFAULT_CLIENT_PARTY_ID
 
@@ -24,32 +24,63 @@ from src.config import DEFAULT_FIRM_ID, DEFAULT_CLIENT_PARTY_ID
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Common LLM phrasings mapped straight to enum members, so parsed items carry
+# the canonical singletons rather than fresh strings that need re-validating
+_ACTIVITY_TYPE_ALIASES = (
+    ('receipt of initial client instructions', WorkActivityType.COMMUNICATIONS_IN),
+    ('letter before action', WorkActivityType.COMMUNICATIONS_OUT),
+    ('defendant\'s response', WorkActivityType.COMMUNICATIONS_IN),
+    ('proceedings issued', WorkActivityType.PREPARATION),
+    ('defence filed', WorkActivityType.REVIEW),
+    ('reply served', WorkActivityType.DRAFTING),
+    ('case management conference', WorkActivityType.ATTENDANCE_COURT),
+    ('standard disclosure', WorkActivityType.PREPARATION),
+    ('witness statements', WorkActivityType.PREPARATION),
+    ('expert reports', WorkActivityType.REVIEW),
+    ('trial bundle', WorkActivityType.PREPARATION),
+    ('trial', WorkActivityType.ATTENDANCE_COURT),
+    ('judgment', WorkActivityType.ATTENDANCE_COURT),
+)
+
+_DISBURSEMENT_TYPE_ALIASES = (
+    ('court fee', DisbursementType.COURT_FEE),
+    ('counsel\'s fee', DisbursementType.COUNSEL_FEE),
+    ('expert\'s fee', DisbursementType.EXPERT_FEE),
+    ('travel', DisbursementType.TRAVEL_EXPENSE),
+    ('photocopying', DisbursementType.PHOTOCOPYING),
+    ('process server', DisbursementType.PROCESS_SERVER),
+    ('miscellaneous', DisbursementType.OTHER),
+)
+
 class DocumentProcessor:
     def __init__(self, graph_ops):
         """Initialize document processor with graph operations."""
         self.graph_ops = graph_ops
-        self.llm_ops = LLMOperations()
+        self.llm_ops = get_llm_operations()
         self.current_case_id = None
         self.current_fee_earner_id = None
         logger.info("DocumentProcessor initialized")
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-            is_separator_regex=False
-        )
         self.default_firm_id = DEFAULT_FIRM_ID
         self.default_client_party_id = DEFAULT_CLIENT_PARTY_ID
         logger.info(f"Using default firm ID: {self.default_firm_id}")
         logger.info(f"Using default client party ID: {self.default_client_party_id}")
+
+    def warm(self) -> None:
+        """Load LLM clients and open a Neo4j connection ahead of the first document."""
+        self.llm_ops.warm()
+        self.graph_ops.driver.verify_connectivity()
     
-    def process_document(self, file_path: str, legal_case: Optional[LegalCase] = None, case_reference: Optional[str] = None, status_callback=None) -> Dict[str, Any]:
-        """Process a document and extract structured information."""
+    def process_document(self, file_path: str, legal_case: Optional[LegalCase] = None, case_reference: Optional[str] = None, status_callback=None, data: Optional[bytes] = None) -> Dict[str, Any]:
+        """Process a document and extract structured information.
+
+        When ``data`` is given it holds the file's bytes and ``file_path`` is only
+        used for the document's name and type, so uploads never touch disk.
+        """
         try:
             logger.info(f"Starting to process document: {file_path}")
             
             # Load document content first
-            content = self.load_document(file_path)
+            content = self.load_document(file_path, data)
             logger.info(f"Document loaded, content length: {len(content)}")
             
             # Set current case ID if provided or find case by reference
@@ -106,18 +137,14 @@ class DocumentProcessor:
             logger.info("Document stored in database")
             
             # Store chunks
-            for chunk in chunks:
-                self.graph_ops.create_document_chunk(chunk, legal_case)
+            self.graph_ops.create_document_chunks(self.current_case_id, chunks)
             logger.info("Document chunks stored in database")
             
-            # Store work items
-            for work_item in work_items:
-                self.graph_ops.create_work_item(self.current_case_id, work_item)
+            # Store work items and disbursements, one batched write each
+            self.graph_ops.create_work_items(self.current_case_id, work_items)
             logger.info("Work items stored in database")
             
-            # Store disbursements
-            for disbursement in disbursements:
-                self.graph_ops.create_disbursement(self.current_case_id, disbursement)
+            self.graph_ops.create_disbursements(self.current_case_id, disbursements)
             logger.info("Disbursements stored in database")
             
             if status_callback:
@@ -136,22 +163,11 @@ class DocumentProcessor:
                 status_callback(f"Error: {str(e)}")
             raise
     
-    def load_document(self, file_path: str) -> str:
-        """Load document content based on file type."""
+    def load_document(self, file_path: str, data: Optional[bytes] = None) -> str:
+        """Load document content based on file type, from ``data`` if given."""
         try:
             logger.info(f"Loading document: {file_path}")
-            file_extension = os.path.splitext(file_path)[1].lower()
-            
-            if file_extension == '.pdf':
-                loader = PyPDFLoader(file_path)
-                pages = loader.load()
-                content = "\n".join(page.page_content for page in pages)
-            elif file_extension == '.txt':
-                loader = TextLoader(file_path)
-                content = loader.load()[0].page_content
-            else:
-                raise ValueError(f"Unsupported file type: {file_extension}")
-            
+            content = extract_text(file_path, data)
             logger.info(f"Document loaded successfully, content length: {len(content)}")
             return content
             
@@ -164,7 +180,7 @@ class DocumentProcessor:
         try:
             logger.info("Creating document chunks")
             chunks = []
-            text_chunks = self.text_splitter.split_text(content)
+            text_chunks = self.llm_ops.text_splitter.split_text(content)
             
             for i, chunk_text in enumerate(text_chunks):
                 chunk = DocumentChunk(
@@ -197,7 +213,7 @@ class DocumentProcessor:
         
         work_items_prompt = f"""Extract work items from the following text. For each work item, provide:
         - date_of_work (YYYY-MM-DD)
-        - activity_type (must be one of: {', '.join([t.value for t in ActivityType])})
+        - activity_type (must be one of: {ACTIVITY_TYPES_STR})
         - description
         - time_spent_units (integer, default to 0 if not specified)
         - time_spent_decimal_hours (float, default to 0.0 if not specified)
@@ -297,7 +313,7 @@ class DocumentProcessor:
         
         disbursements_prompt = f"""Extract disbursements from the following text. For each disbursement, provide:
         - date_incurred (YYYY-MM-DD)
-        - disbursement_type (must be one of: {', '.join([t.value for t in DisbursementType])})
+        - disbursement_type (must be one of: {DISBURSEMENT_TYPES_STR})
         - description
         - payee_name
         - amount_net_gbp (REQUIRED: must be a valid number, use 0.0 if not specified)
@@ -381,62 +397,34 @@ class DocumentProcessor:
         logger.info(f"Entity extraction complete. Found {len(work_items)} work items and {len(disbursements)} disbursements")
         return work_items, disbursements
 
-    def _map_activity_type(self, activity_type: str) -> str:
+    def _map_activity_type(self, activity_type: str) -> WorkActivityType:
         """Map activity type to valid enum value."""
         activity_type = activity_type.lower()
         
-        # Map common variations to valid enum values
-        mapping = {
-            'receipt of initial client instructions': 'Communications In (Letters/Emails)',
-            'letter before action': 'Communications Out (Letters/Emails)',
-            'defendant\'s response': 'Communications In (Letters/Emails)',
-            'proceedings issued': 'Preparation',
-            'defence filed': 'Review',
-            'reply served': 'Drafting',
-            'case management conference': 'Attendance at Court',
-            'standard disclosure': 'Preparation',
-            'witness statements': 'Preparation',
-            'expert reports': 'Review',
-            'trial bundle': 'Preparation',
-            'trial': 'Attendance at Court',
-            'judgment': 'Attendance at Court'
-        }
-        
-        for key, value in mapping.items():
+        for key, value in _ACTIVITY_TYPE_ALIASES:
             if key in activity_type:
                 return value
             
         # Default to Preparation if no match found
-        return 'Preparation'
+        return WorkActivityType.PREPARATION
 
-    def _map_disbursement_type(self, disbursement_type: str) -> str:
+    def _map_disbursement_type(self, disbursement_type: str) -> DisbursementType:
         """Map disbursement type to valid enum value."""
         disbursement_type = disbursement_type.lower()
         
-        # Map common variations to valid enum values
-        mapping = {
-            'court fee': 'Court Fee',
-            'counsel\'s fee': "Counsel's Fee",
-            'expert\'s fee': "Expert's Fee",
-            'travel': 'Travel Expense',
-            'photocopying': 'Photocopying (External)',
-            'process server': 'Process Server Fee',
-            'miscellaneous': 'Other'
-        }
-        
-        for key, value in mapping.items():
+        for key, value in _DISBURSEMENT_TYPE_ALIASES:
             if key in disbursement_type:
                 return value
             
         # Default to Other if no match found
-        return 'Other'
+        return DisbursementType.OTHER
 
     def _fix_date_format(self, date_str: str) -> str:
         """Fix date format to YYYY-MM-DD."""
         try:
             # Handle date ranges by taking the first date
             if '-' in date_str and '/' in date_str:
-                date_str = date_str.split('-')[0]
+                date_str = date_str.partition('-')[0]
             
             # Parse and reformat the date
             date_obj = datetime.strptime(date_str, '%Y-%m-%d')
@@ -445,18 +433,15 @@ class DocumentProcessor:
             # If parsing fails, return today's date as fallback
             return datetime.now().strftime('%Y-%m-%d')
     
-    def process_directory(self, directory_path: str, legal_case: Optional[LegalCase] = None, case_reference: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Process all documents in a directory and extract structured entities."""
-        all_results = []
+    def process_directory(self, directory_path: str, legal_case: Optional[LegalCase] = None, case_reference: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Process all documents in a directory, yielding each document's extracted entities."""
         with self.graph_ops as graph:
             for file_path in Path(directory_path).glob('*'):
                 if file_path.suffix.lower() in ['.pdf', '.txt', '.md']:
                     try:
-                        result = self.process_document(str(file_path), legal_case, case_reference)
-                        all_results.append(result)
+                        yield self.process_document(str(file_path), legal_case, case_reference)
                     except Exception as e:
                         print(f"Error processing {file_path}: {str(e)}")
-        return all_results
 
     def _extract_case_reference(self, content: str) -> str:
         """Extract case reference from document content."""
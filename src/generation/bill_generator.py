@@ -10,19 +10,28 @@ from ..models.domain import (
     LegalCase, WorkItem, Disbursement, FeeEarner,
     Bill, BillSection, BillItem
 )
-from ..llm.operations import LLMOperations
+from ..models.columnar import WorkItemTable, DisbursementTable
+from ..llm.operations import get_llm_operations
 from ..graph.operations import Neo4jGraph
 
 logger = logging.getLogger(__name__)
 
+VAT_RATE = 0.20
+
 class BillGenerator:
     def __init__(self, graph_ops: Neo4jGraph):
         """Initialize bill generator with graph operations."""
         self.graph_ops = graph_ops
-        self.llm_ops = LLMOperations()
+        self.llm_ops = get_llm_operations()
         self.template_loader = jinja2.FileSystemLoader(searchpath="./templates")
         self.template_env = jinja2.Environment(loader=self.template_loader)
         logger.info("BillGenerator initialized")
+
+    def warm(self) -> None:
+        """Load LLM clients, the bill template and a Neo4j connection ahead of the first bill."""
+        self.llm_ops.warm()
+        self.template_env.get_template("bill_of_costs.html")
+        self.graph_ops.driver.verify_connectivity()
         
     def generate_bill(self, case_id: Optional[str] = None) -> Bill:
         """Generate a bill of costs for a case."""
@@ -56,16 +65,17 @@ class BillGenerator:
             
             logger.info(f"Found {len(work_items)} work items and {len(disbursements)} disbursements")
             
-            # Create bill sections
+            # Bill lines are built from already-validated work items and disbursements,
+            # so skip re-running field validation on each one
             sections = []
             
             # Work items section
             if work_items:
-                work_items_section = BillSection(
+                work_items_section = BillSection.model_construct(
                     section_id=str(uuid.uuid4()),
                     title="Work Done",
                     items=[
-                        BillItem(
+                        BillItem.model_construct(
                             item_id=str(uuid.uuid4()),
                             date=item.date_of_work,
                             description=item.description,
@@ -83,11 +93,11 @@ class BillGenerator:
             
             # Disbursements section
             if disbursements:
-                disbursements_section = BillSection(
+                disbursements_section = BillSection.model_construct(
                     section_id=str(uuid.uuid4()),
                     title="Disbursements",
                     items=[
-                        BillItem(
+                        BillItem.model_construct(
                             item_id=str(uuid.uuid4()),
                             date=item.date_incurred,
                             description=f"{item.description} ({item.disbursement_type.value})",
@@ -100,16 +110,13 @@ class BillGenerator:
                 sections.append(disbursements_section)
                 logger.info(f"Created disbursements section with {len(disbursements_section.items)} items")
             
-            # Calculate totals
-            total_amount = sum(
-                sum(item.amount for item in section.items)
-                for section in sections
-            )
-            
-            recoverable_amount = sum(
-                sum(item.amount for item in section.items if item.is_recoverable)
-                for section in sections
-            )
+            # Calculate totals in integer pence over columnar views to avoid float drift
+            work_table = WorkItemTable.from_work_items(work_items)
+            disbursement_table = DisbursementTable.from_disbursements(disbursements)
+            total_pence = work_table.total_pence() + disbursement_table.total_pence()
+            recoverable_pence = work_table.recoverable_pence() + disbursement_table.recoverable_pence()
+            total_amount = total_pence / 100
+            recoverable_amount = recoverable_pence / 100
             
             # Create bill
             bill = Bill(
@@ -207,11 +214,17 @@ class BillGenerator:
                         disbursements_by_type[disbursement_type].append(item)
 
             # Calculate totals
-            profit_costs = sum(item.amount for section in bill.sections if section.title == "Work Done" for item in section.items)
-            disbursements = sum(item.amount for section in bill.sections if section.title == "Disbursements" for item in section.items)
-            vat_on_profit_costs = profit_costs * 0.20  # 20% VAT
-            vat_on_disbursements = disbursements * 0.20  # 20% VAT
-            grand_total = profit_costs + disbursements + vat_on_profit_costs + vat_on_disbursements
+            profit_costs_pence = sum(item.amount_pence for section in bill.sections if section.title == "Work Done" for item in section.items)
+            disbursements_pence = sum(item.amount_pence for section in bill.sections if section.title == "Disbursements" for item in section.items)
+            vat_on_profit_costs_pence = round(profit_costs_pence * VAT_RATE)
+            vat_on_disbursements_pence = round(disbursements_pence * VAT_RATE)
+            profit_costs = profit_costs_pence / 100
+            disbursements = disbursements_pence / 100
+            vat_on_profit_costs = vat_on_profit_costs_pence / 100
+            vat_on_disbursements = vat_on_disbursements_pence / 100
+            grand_total = (
+                profit_costs_pence + disbursements_pence + vat_on_profit_costs_pence + vat_on_disbursements_pence
+            ) / 100
 
             # Load and render template
             template = self.template_env.get_template("bill_of_costs.html")
@@ -4,12 +4,12 @@ import os
 from pathlib import Path
 
 from ..models.domain import LegalCase, DocumentType, DocumentChunk
-from ..llm.operations import LLMOperations
+from ..llm.operations import get_llm_operations
 from ..graph.operations import Neo4jGraph
 
 class DocumentGenerator:
     def __init__(self):
-        self.llm_ops = LLMOperations()
+        self.llm_ops = get_llm_operations()
         self.graph = Neo4jGraph()
 
     def generate_document(self, case_id: str, doc_type: DocumentType) -> str:
@@ -0,0 +1,41 @@
+from functools import lru_cache
+import atexit
+import os
+from dotenv import load_dotenv
+from neo4j import GraphDatabase, Driver
+
+load_dotenv()
+
+# Connection pool settings shared by every driver the app creates
+NEO4J_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "50"))
+NEO4J_ACQ_TIMEOUT = float(os.getenv("NEO4J_ACQ_TIMEOUT", "60"))
+NEO4J_CONNECTION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "15"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "1200"))
+
+def pool_settings() -> dict:
+    """Keyword arguments for GraphDatabase.driver tuning its connection pool."""
+    return {
+        "max_connection_pool_size": NEO4J_POOL_SIZE,
+        "connection_acquisition_timeout": NEO4J_ACQ_TIMEOUT,
+        "connection_timeout": NEO4J_CONNECTION_TIMEOUT,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME,
+        "keep_alive": True,
+    }
+
+@lru_cache(maxsize=1)
+def get_driver() -> Driver:
+    """Return the process-wide Neo4j driver, creating it on first use.
+
+    The driver is closed automatically at interpreter exit, so callers
+    should open sessions from it but never close it themselves.
+    """
+    driver = GraphDatabase.driver(
+        os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+        auth=(
+            os.getenv("NEO4J_USERNAME", os.getenv("NEO4J_USER", "neo4j")),
+            os.getenv("NEO4J_PASSWORD", "password")
+        ),
+        **pool_settings()
+    )
+    atexit.register(driver.close)
+    return driver
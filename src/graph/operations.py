@@ -1,6 +1,7 @@
-from typing import List, Optional, Dict, Any
-from neo4j import GraphDatabase
+from typing import List, Optional, Dict, Any, NamedTuple
+from neo4j import GraphDatabase, READ_ACCESS, WRITE_ACCESS
 from neo4j.exceptions import ServiceUnavailable
+from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -9,18 +10,143 @@ import uuid
 from datetime import datetime
 import logging
 import json
+import time
+import functools
+import threading
+from collections import OrderedDict
+from enum import Enum
 
 # Add src directory to Python path
 src_path = str(Path(__file__).parent.parent.parent)
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from src.models.domain import LegalCase, WorkItem, Disbursement, FeeEarner, DocumentChunk
+from src.graph.driver import pool_settings
+from src.models.domain import (
+    LegalCase, WorkItem, Disbursement, FeeEarner, DocumentChunk,
+    WorkActivityType, DisbursementType, normalize_embedding
+)
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Fallbacks applied to work item / disbursement records before model_construct
+WORK_ITEM_DEFAULTS = {
+    "time_spent_units": 0,
+    "time_spent_decimal_hours": 0.0,
+    "applicable_hourly_rate_gbp": 0.0,
+    "claimed_amount_gbp": 0.0,
+    "is_recoverable": True,
+    "related_document_ids": list,
+    "disputed": False,
+}
+DISBURSEMENT_DEFAULTS = {
+    "amount_net_gbp": 0.0,
+    "vat_gbp": 0.0,
+    "amount_gross_gbp": 0.0,
+    "is_recoverable": True,
+    "disputed": False,
+}
+
+def _to_neo4j_value(value: Any) -> Any:
+    """Convert model values Neo4j can't store (UUIDs, enums) to their string form."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return [_to_neo4j_value(item) for item in value]
+    return value
+
+class CaseSummary(NamedTuple):
+    case_id: str
+    reference: Optional[str]
+    name: Optional[str]
+
+READ_CACHE_MAXSIZE = 1024
+READ_CACHE_TTL_SECONDS = 30.0
+
+METADATA_PREFIX = "metadata."
+
+# Chunks written per UNWIND transaction
+CHUNK_WRITE_BATCH_SIZE = 1000
+# Work items / disbursements written per UNWIND transaction
+ENTITY_WRITE_BATCH_SIZE = 10000
+
+def flatten_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Flatten a metadata dict into prefixed scalar node properties."""
+    if not metadata:
+        return {}
+    return {f"{METADATA_PREFIX}{key}": value for key, value in metadata.items()}
+
+def unflatten_metadata(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Pop prefixed metadata properties off a node dict and rebuild the metadata dict."""
+    prefix_len = len(METADATA_PREFIX)
+    keys = [key for key in properties if key.startswith(METADATA_PREFIX)]
+    return {key[prefix_len:]: properties.pop(key) for key in keys}
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int = READ_CACHE_MAXSIZE, ttl: float = READ_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        # One Neo4jGraph is shared by the Streamlit worker threads
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+def _copy_cached(value):
+    # Callers may mutate returned models, so each gets its own copy
+    if isinstance(value, BaseModel):
+        return value.model_copy(deep=True)
+    return value
+
+def _cached_read(method):
+    """Memoize an idempotent read on the instance's TTL cache.
+
+    Empty results (None/False) are not cached so that a record created
+    after a miss is picked up on the next lookup.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (
+            method.__name__,
+            *(str(arg) for arg in args),
+            tuple((name, str(value)) for name, value in sorted(kwargs.items()))
+        )
+        cached = self._read_cache.get(key)
+        if cached is not None:
+            return _copy_cached(cached)
+        value = method(self, *args, **kwargs)
+        if value:
+            self._read_cache.set(key, _copy_cached(value))
+        return value
+    return wrapper
+
 class Neo4jGraph:
     def __init__(self):
         """Initialize Neo4j connection."""
@@ -29,6 +155,7 @@ class Neo4jGraph:
         self.password = os.getenv("NEO4J_PASSWORD", "password")
         self.database = os.getenv("NEO4J_DATABASE", "neo4j")
         self.driver = None
+        self._read_cache = _TTLCache()
         self.connect()
 
     def connect(self):
@@ -36,7 +163,8 @@ class Neo4jGraph:
         if not self.driver:
             self.driver = GraphDatabase.driver(
                 self.uri,
-                auth=(self.user, self.password)
+                auth=(self.user, self.password),
+                **pool_settings()
             )
 
     def close(self):
@@ -54,6 +182,10 @@ class Neo4jGraph:
         """Context manager exit."""
         self.close()
 
+    def invalidate_read_cache(self):
+        """Drop all memoized read results."""
+        self._read_cache.clear()
+
     def create_case(self, case: LegalCase) -> LegalCase:
         """Create a new case."""
         # Check if case already exists
@@ -61,7 +193,8 @@ class Neo4jGraph:
         if existing_case:
             return existing_case
             
-        with self.driver.session() as session:
+        self.invalidate_read_cache()
+        with self.driver.session(database=self.database) as session:
             result = session.run(
                 """
                 MERGE (c:Case {case_id: $case_id})
@@ -70,7 +203,7 @@ class Neo4jGraph:
                     c.case_reference_number = $case_reference_number,
                     c.our_firm_id = $our_firm_id,
                     c.our_client_party_id = $our_client_party_id,
-                    c.date_opened = date($date_opened),
+                    c.date_opened = $date_opened,
                     c.status = $status
                 RETURN c
                 """,
@@ -79,7 +212,7 @@ class Neo4jGraph:
                 case_reference_number=case.case_reference_number,
                 our_firm_id=str(case.our_firm_id),
                 our_client_party_id=str(case.our_client_party_id),
-                date_opened=case.date_opened.isoformat() if case.date_opened else None,
+                date_opened=case.date_opened,
                 status=case.status
             )
             created_case = result.single()[0]
@@ -93,7 +226,7 @@ class Neo4jGraph:
 
     def create_work_item(self, case_id: str, work_item: WorkItem) -> str:
         """Create a new work item and link it to a case."""
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             result = session.execute_write(
                 self._create_work_item_tx,
                 case_id,
@@ -112,7 +245,7 @@ class Neo4jGraph:
             work_item_id: $work_item_id,
             case_id: $case_id,
             fee_earner_id: $fee_earner_id,
-            date_of_work: date($date_of_work),
+            date_of_work: $date_of_work,
             activity_type: $activity_type,
             description: $description,
             time_spent_units: $time_spent_units,
@@ -127,14 +260,66 @@ class Neo4jGraph:
             dispute_reason: $dispute_reason
         })
         CREATE (c)-[:HAS_WORK_ITEM]->(w)
-        RETURN w.work_item_id
         """
-        result = tx.run(query, {"case_id": case_id, **work_item_data})
-        return result.single()[0]
+        summary = tx.run(query, {"case_id": case_id, **work_item_data}).consume()
+        if not summary.counters.nodes_created:
+            raise ValueError(f"Case not found with ID: {case_id}")
+        return work_item_data["work_item_id"]
+
+    def create_work_items(self, case_id: str, work_items: List[WorkItem]) -> List[str]:
+        """Create or update work items linked to a case, in batched write transactions."""
+        return self._merge_entities(self._merge_work_items_tx, case_id, work_items)
+
+    def create_disbursements(self, case_id: str, disbursements: List[Disbursement]) -> List[str]:
+        """Create or update disbursements linked to a case, in batched write transactions."""
+        return self._merge_entities(self._merge_disbursements_tx, case_id, disbursements)
+
+    def _merge_entities(self, tx_function, case_id: str, entities) -> List[str]:
+        rows = [
+            {key: _to_neo4j_value(value) for key, value in entity.model_dump().items()}
+            for entity in entities
+        ]
+        ids = []
+        with self.driver.session(database=self.database) as session:
+            for start in range(0, len(rows), ENTITY_WRITE_BATCH_SIZE):
+                ids.extend(session.execute_write(
+                    tx_function, str(case_id), rows[start:start + ENTITY_WRITE_BATCH_SIZE]
+                ))
+        return ids
+
+    @staticmethod
+    def _merge_work_items_tx(tx, case_id: str, rows: List[Dict[str, Any]]) -> List[str]:
+        query = """
+        MATCH (c:Case {case_id: $case_id})
+        UNWIND $rows AS row
+        MERGE (w:WorkItem {work_item_id: row.work_item_id})
+        SET w += row, w.case_id = $case_id
+        MERGE (c)-[:HAS_WORK_ITEM]->(w)
+        RETURN w.work_item_id as work_item_id
+        """
+        ids = [record["work_item_id"] for record in tx.run(query, case_id=case_id, rows=rows)]
+        if rows and not ids:
+            raise ValueError(f"Case not found with ID: {case_id}")
+        return ids
+
+    @staticmethod
+    def _merge_disbursements_tx(tx, case_id: str, rows: List[Dict[str, Any]]) -> List[str]:
+        query = """
+        MATCH (c:Case {case_id: $case_id})
+        UNWIND $rows AS row
+        MERGE (d:Disbursement {disbursement_id: row.disbursement_id})
+        SET d += row, d.case_id = $case_id
+        MERGE (c)-[:HAS_DISBURSEMENT]->(d)
+        RETURN d.disbursement_id as disbursement_id
+        """
+        ids = [record["disbursement_id"] for record in tx.run(query, case_id=case_id, rows=rows)]
+        if rows and not ids:
+            raise ValueError(f"Case not found with ID: {case_id}")
+        return ids
 
     def create_fee_earner(self, case_id: str, fee_earner: FeeEarner) -> str:
         """Create a new fee earner and link it to a case."""
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             result = session.execute_write(
                 self._create_fee_earner_tx,
                 case_id,
@@ -153,11 +338,13 @@ class Neo4jGraph:
             hourly_rate: $hourly_rate
         })
         CREATE (c)-[:HAS_FEE_EARNER]->(f)
-        RETURN f.fee_earner_id
         """
-        result = tx.run(query, {"case_id": case_id, **fee_earner_data})
-        return result.single()[0]
+        summary = tx.run(query, {"case_id": case_id, **fee_earner_data}).consume()
+        if not summary.counters.nodes_created:
+            raise ValueError(f"Case not found with ID: {case_id}")
+        return fee_earner_data["fee_earner_id"]
 
+    @_cached_read
     def get_case(self, case_id: str) -> Optional[LegalCase]:
         """Get a case by its ID."""
         try:
@@ -181,7 +368,7 @@ class Neo4jGraph:
                    c.our_firm_id as our_firm_id,
                    c.our_client_party_id as our_client_party_id
             """
-            with self.driver.session(database=self.database) as session:
+            with self._read_session() as session:
                 result = session.run(query, {"case_id": case_id})
                 case_data = result.single()
                 
@@ -206,36 +393,60 @@ class Neo4jGraph:
             logger.error(f"Error getting case: {str(e)}")
             return None
 
-    def create_document_chunk(self, chunk: DocumentChunk, case: LegalCase):
+    def create_document_chunk(self, case_id: str, chunk: DocumentChunk):
         """Create a document chunk node and link it to its case."""
-        with self.driver.session() as session:
-            session.run(
-                """
-                MATCH (c:Case {case_id: $case_id})
-                CREATE (d:DocumentChunk {
-                    chunk_id: $chunk_id,
-                    source_document_id: $source_document_id,
-                    text_content: $text_content,
-                    page_number_start: $page_number_start,
-                    page_number_end: $page_number_end,
-                    embedding: $embedding,
-                    metadata: $metadata
-                })
-                CREATE (c)-[:HAS_DOCUMENT]->(d)
-                """,
-                case_id=str(case.case_id),
-                chunk_id=str(chunk.chunk_id),
-                source_document_id=str(chunk.source_document_id),
-                text_content=chunk.text_content,
-                page_number_start=chunk.page_number_start,
-                page_number_end=chunk.page_number_end,
-                embedding=json.dumps(chunk.embedding) if chunk.embedding is not None else None,
-                metadata=json.dumps(chunk.metadata) if chunk.metadata else "{}"
-            )
+        self.create_document_chunks(case_id, [chunk])
+
+    def create_document_chunks(self, case_id: str, chunks: List[DocumentChunk]):
+        """Create document chunk nodes linked to their case, in batched write transactions."""
+        self.invalidate_read_cache()
+        rows = [self._chunk_row(chunk) for chunk in chunks]
+        with self.driver.session(database=self.database) as session:
+            for start in range(0, len(rows), CHUNK_WRITE_BATCH_SIZE):
+                session.execute_write(
+                    self._create_document_chunks_tx,
+                    str(case_id),
+                    rows[start:start + CHUNK_WRITE_BATCH_SIZE]
+                )
+
+    @staticmethod
+    def _chunk_row(chunk: DocumentChunk) -> Dict[str, Any]:
+        # Only the unit-normalized float embedding is stored: it is what the vector
+        # index reads, and the index's own quantization keeps it compact on disk
+        embedding = None
+        if chunk.embedding is not None:
+            embedding = normalize_embedding(chunk.embedding)
+        return {
+            "chunk_id": str(chunk.chunk_id),
+            "source_document_id": str(chunk.source_document_id),
+            "text_content": chunk.text_content,
+            "page_number_start": chunk.page_number_start,
+            "page_number_end": chunk.page_number_end,
+            "embedding": embedding,
+            "metadata": flatten_metadata(chunk.metadata)
+        }
+
+    @staticmethod
+    def _create_document_chunks_tx(tx, case_id: str, rows: List[Dict[str, Any]]):
+        query = """
+        MATCH (c:Case {case_id: $case_id})
+        UNWIND $rows AS row
+        CREATE (d:DocumentChunk {
+            chunk_id: row.chunk_id,
+            source_document_id: row.source_document_id,
+            text_content: row.text_content,
+            page_number_start: row.page_number_start,
+            page_number_end: row.page_number_end,
+            embedding: row.embedding
+        })
+        SET d += row.metadata
+        CREATE (c)-[:HAS_DOCUMENT]->(d)
+        """
+        tx.run(query, case_id=case_id, rows=rows).consume()
 
     def search_similar_chunks(self, embedding: List[float], limit: int = 5) -> List[DocumentChunk]:
         """Search for similar document chunks using vector similarity."""
-        with self.driver.session() as session:
+        with self._read_session() as session:
             result = session.execute_read(
                 self._search_similar_chunks_tx,
                 embedding,
@@ -256,18 +467,18 @@ class Neo4jGraph:
         chunks = []
         for record in result:
             chunk_data = dict(record["node"])
-            # Convert JSON strings back to Python objects
-            if chunk_data.get("embedding"):
+            # The stored float embedding is returned as indexed; older nodes hold a JSON float list
+            if isinstance(chunk_data.get("embedding"), str):
                 chunk_data["embedding"] = json.loads(chunk_data["embedding"])
-            if chunk_data.get("metadata"):
-                chunk_data["metadata"] = json.loads(chunk_data["metadata"])
+            chunk_data["metadata"] = unflatten_metadata(chunk_data)
             chunk_data["case_id"] = record["case_id"]
             chunks.append(DocumentChunk(**chunk_data))
         return chunks
 
+    @_cached_read
     def document_exists(self, file_path: str) -> bool:
         """Check if a document has already been processed."""
-        with self.driver.session() as session:
+        with self._read_session() as session:
             result = session.run(
                 """
                 MATCH (c:DocumentChunk)
@@ -278,9 +489,10 @@ class Neo4jGraph:
             )
             return result.single()["count"] > 0
 
+    @_cached_read
     def find_case_by_title(self, title: str) -> Optional[LegalCase]:
         """Find a case by its title."""
-        with self.driver.session() as session:
+        with self._read_session() as session:
             result = session.run(
                 """
                 MATCH (c:Case)
@@ -305,9 +517,21 @@ class Neo4jGraph:
             return existing_case
         raise ValueError(f"No case found with reference: {case.case_reference_number}")
 
+    def get_case_summaries(self) -> List[CaseSummary]:
+        """Get the ID, reference and name of every case, most recent first."""
+        with self._read_session() as session:
+            result = session.run("""
+                MATCH (c:Case)
+                RETURN c.case_id as case_id,
+                       c.case_reference_number as reference,
+                       c.case_name as name
+                ORDER BY c.created_at DESC
+            """)
+            return [CaseSummary(record["case_id"], record["reference"], record["name"]) for record in result]
+
     def get_all_cases(self) -> List[LegalCase]:
         """Get all cases from the database."""
-        with self.driver.session() as session:
+        with self._read_session() as session:
             result = session.run("""
                 MATCH (c:Case)
                 OPTIONAL MATCH (c)-[:HAS_WORK_ITEM]->(w:WorkItem)
@@ -396,11 +620,20 @@ class Neo4jGraph:
             logger.error(traceback.format_exc())
             raise
 
-    def run_query(self, query, parameters=None):
+    def _read_session(self):
+        """Open a session routed for reads (to followers, in a cluster)."""
+        return self.driver.session(database=self.database, default_access_mode=READ_ACCESS)
+
+    def run_query(self, query, parameters=None, access_mode=WRITE_ACCESS):
         """Run a Cypher query and return the result object."""
-        with self.driver.session(database=self.database) as session:
+        with self.driver.session(database=self.database, default_access_mode=access_mode) as session:
             return session.run(query, parameters or {})
 
+    def stream_query(self, query, parameters=None):
+        """Run a Cypher query and yield its records as they arrive, keeping the session open."""
+        with self._read_session() as session:
+            yield from session.run(query, parameters or {})
+
     def store_case(self, case):
         """Store a LegalCase object in Neo4j."""
         # Check if case already exists
@@ -409,7 +642,8 @@ class Neo4jGraph:
             logger.info(f"Case already exists with reference {case.case_reference_number}")
             return existing_case
             
-        with self.driver.session() as session:
+        self.invalidate_read_cache()
+        with self.driver.session(database=self.database) as session:
             # Log the case data being stored
             logger.info(f"Storing new case with ID: {case.case_id}")
             logger.info(f"Case data: {case.model_dump()}")
@@ -425,7 +659,7 @@ class Neo4jGraph:
                 "case_reference_number": case.case_reference_number,
                 "our_firm_id": str(case.our_firm_id) if case.our_firm_id else None,
                 "our_client_party_id": str(case.our_client_party_id) if case.our_client_party_id else None,
-                "date_opened": case.date_opened.isoformat() if case.date_opened else None  # Convert to ISO format string for date()
+                "date_opened": case.date_opened  # Passed as a native date, serialized as a Bolt Date
             }
             
             session.run(
@@ -441,7 +675,7 @@ class Neo4jGraph:
                     c.case_reference_number = $case_reference_number,
                     c.our_firm_id = $our_firm_id,
                     c.our_client_party_id = $our_client_party_id,
-                    c.date_opened = CASE WHEN $date_opened IS NOT NULL THEN date($date_opened) ELSE null END
+                    c.date_opened = $date_opened
                 """,
                 params
             )
@@ -459,7 +693,8 @@ class Neo4jGraph:
 
     def store_document(self, document):
         """Store a SourceDocument object in Neo4j and link it to its case."""
-        with self.driver.session() as session:
+        self.invalidate_read_cache()
+        with self.driver.session(database=self.database) as session:
             session.run(
                 '''
                 MATCH (c:Case {case_id: $case_id})
@@ -475,7 +710,7 @@ class Neo4jGraph:
                     d.author = $author,
                     d.recipient = $recipient,
                     d.extracted_text_path = $extracted_text_path,
-                    d.metadata = $metadata
+                    d += $metadata
                 MERGE (c)-[:HAS_DOCUMENT]->(d)
                 ''', {
                     "document_id": str(document.document_id),
@@ -488,13 +723,13 @@ class Neo4jGraph:
                     "author": document.author,
                     "recipient": document.recipient,
                     "extracted_text_path": document.extracted_text_path,
-                    "metadata": json.dumps(document.metadata) if hasattr(document, 'metadata') else "{}",
+                    "metadata": flatten_metadata(getattr(document, 'metadata', None)),
                 }
             )
 
     def create_disbursement(self, case_id: str, disbursement: Disbursement) -> str:
         """Create a new disbursement and link it to a case."""
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             result = session.execute_write(
                 self._create_disbursement_tx,
                 case_id,
@@ -513,7 +748,7 @@ class Neo4jGraph:
             params = {
                 "case_id": str(case_id),  # Neo4j doesn't support UUID type
                 "disbursement_id": str(disbursement_data['disbursement_id']),  # Neo4j doesn't support UUID type
-                "date_incurred": disbursement_data['date_incurred'].isoformat(),  # Convert to ISO format string for date()
+                "date_incurred": disbursement_data['date_incurred'],  # Passed as a native date, serialized as a Bolt Date
                 "disbursement_type": disbursement_data['disbursement_type'].value if hasattr(disbursement_data['disbursement_type'], 'value') else str(disbursement_data['disbursement_type']),
                 "status": disbursement_data['status'].value if hasattr(disbursement_data['status'], 'value') else str(disbursement_data['status']),
                 "description": disbursement_data['description'],
@@ -555,14 +790,14 @@ class Neo4jGraph:
                 logger.warning(f"Disbursement with ID {params['disbursement_id']} already exists. Skipping creation.")
                 return existing_disbursement["disbursement_id"]
             
-            # Create the disbursement with explicit RETURN clause
-            result = tx.run(
+            # Create the disbursement; the ID is client-generated so no row needs returning
+            summary = tx.run(
                 """
                 MATCH (c:Case {case_id: $case_id})
                 CREATE (d:Disbursement {
                     disbursement_id: $disbursement_id,
                     case_id: $case_id,
-                    date_incurred: date($date_incurred),
+                    date_incurred: $date_incurred,
                     disbursement_type: $disbursement_type,
                     status: $status,
                     description: $description,
@@ -577,24 +812,17 @@ class Neo4jGraph:
                     dispute_reason: $dispute_reason
                 })
                 CREATE (c)-[:HAS_DISBURSEMENT]->(d)
-                RETURN d.disbursement_id as disbursement_id
                 """,
                 params
-            )
+            ).consume()
             
-            # Get the result and verify it
-            record = result.single()
-            if not record:
-                logger.error("Failed to create disbursement - no record returned")
+            # Verify the node was written
+            if not summary.counters.nodes_created:
+                logger.error("Failed to create disbursement - no node created")
                 logger.error(f"Query parameters: {json.dumps(params, default=str)}")
-                raise ValueError("Failed to create disbursement - no record returned")
-            
-            disbursement_id = record.get('disbursement_id')
-            if not disbursement_id:
-                logger.error("Failed to create disbursement - no ID in returned record")
-                logger.error(f"Returned record: {record}")
-                raise ValueError("Failed to create disbursement - no ID in returned record")
+                raise ValueError("Failed to create disbursement - no node created")
             
+            disbursement_id = params["disbursement_id"]
             logger.info(f"Successfully created disbursement with ID: {disbursement_id}")
             return disbursement_id
             
@@ -606,6 +834,7 @@ class Neo4jGraph:
                 logger.error(f"Converted parameters: {json.dumps(params, default=str)}")
             raise
 
+    @_cached_read
     def find_case_by_reference(self, reference: str) -> Optional[LegalCase]:
         """Find a case by its reference number."""
         query = """
@@ -621,7 +850,7 @@ class Neo4jGraph:
                c.our_client_party_id as our_client_party_id
         """
         try:
-            with self.driver.session(database=self.database) as session:
+            with self._read_session() as session:
                 result = session.run(query, {"reference": reference})
                 case_data = result.single()
                 
@@ -649,7 +878,7 @@ class Neo4jGraph:
     def check_db_state(self):
         """Check the current state of the database including indexes, constraints and node counts."""
         try:
-            with self.driver.session() as session:
+            with self._read_session() as session:
                 # Get indexes
                 indexes = []
                 result = session.run("SHOW INDEXES")
@@ -718,7 +947,7 @@ class Neo4jGraph:
                    w.disputed as disputed,
                    w.dispute_reason as dispute_reason
             """
-            with self.driver.session(database=self.database) as session:
+            with self._read_session() as session:
                 result = session.run(query, {"case_id": str(case_id)})
                 work_items = []
                 for record in result:
@@ -738,17 +967,16 @@ class Neo4jGraph:
                         item_dict["fee_earner_id"] = uuid.UUID(item_dict["fee_earner_id"])
                     if item_dict.get("related_document_ids"):
                         item_dict["related_document_ids"] = [uuid.UUID(doc_id) for doc_id in item_dict["related_document_ids"]]
+                    if item_dict.get("activity_type"):
+                        item_dict["activity_type"] = WorkActivityType(item_dict["activity_type"])
                     
-                    # Set default values for missing fields
-                    item_dict.setdefault("time_spent_units", 0)
-                    item_dict.setdefault("time_spent_decimal_hours", 0.0)
-                    item_dict.setdefault("applicable_hourly_rate_gbp", 0.0)
-                    item_dict.setdefault("claimed_amount_gbp", 0.0)
-                    item_dict.setdefault("is_recoverable", True)
-                    item_dict.setdefault("related_document_ids", [])
-                    item_dict.setdefault("disputed", False)
+                    # Set default values for missing fields (absent properties come back as None)
+                    for key, default in WORK_ITEM_DEFAULTS.items():
+                        if item_dict.get(key) is None:
+                            item_dict[key] = default() if callable(default) else default
                     
-                    work_items.append(WorkItem(**item_dict))
+                    # Records were written by this class, so skip re-validation
+                    work_items.append(WorkItem.from_neo4j_record(item_dict))
                 return work_items
         except Exception as e:
             logger.error(f"Error getting work items: {str(e)}")
@@ -774,7 +1002,7 @@ class Neo4jGraph:
                    d.disputed as disputed,
                    d.dispute_reason as dispute_reason
             """
-            with self.driver.session(database=self.database) as session:
+            with self._read_session() as session:
                 result = session.run(query, {"case_id": str(case_id)})
                 disbursements = []
                 for record in result:
@@ -792,15 +1020,16 @@ class Neo4jGraph:
                         item_dict["case_id"] = uuid.UUID(item_dict["case_id"])
                     if item_dict.get("voucher_document_id"):
                         item_dict["voucher_document_id"] = uuid.UUID(item_dict["voucher_document_id"])
+                    if item_dict.get("disbursement_type"):
+                        item_dict["disbursement_type"] = DisbursementType(item_dict["disbursement_type"])
                     
-                    # Set default values for missing fields
-                    item_dict.setdefault("amount_net_gbp", 0.0)
-                    item_dict.setdefault("vat_gbp", 0.0)
-                    item_dict.setdefault("amount_gross_gbp", 0.0)
-                    item_dict.setdefault("is_recoverable", True)
-                    item_dict.setdefault("disputed", False)
+                    # Set default values for missing fields (absent properties come back as None)
+                    for key, default in DISBURSEMENT_DEFAULTS.items():
+                        if item_dict.get(key) is None:
+                            item_dict[key] = default
                     
-                    disbursements.append(Disbursement(**item_dict))
+                    # Records were written by this class, so skip re-validation
+                    disbursements.append(Disbursement.from_neo4j_record(item_dict))
                 return disbursements
         except Exception as e:
             logger.error(f"Error getting disbursements: {str(e)}")
@@ -0,0 +1,70 @@
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import os
+import sqlite3
+import threading
+
+# SQLite caps the number of bound parameters per statement (999 on older builds)
+_MAX_QUERY_PARAMS = 500
+
+def text_hash(text: str) -> str:
+    """Return the sha256 hex digest used as the cache key for a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """Persistent embedding cache keyed by (sha256(text), model)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("EMBEDDING_CACHE_PATH", "./cache/embeddings.sqlite")
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    vec BLOB NOT NULL,
+                    PRIMARY KEY (hash, model)
+                )
+                """
+            )
+
+    def get_many(self, hashes: Iterable[str], model: str) -> Dict[str, List[float]]:
+        """Look up cached vectors for the given hashes, returning only the hits."""
+        unique = list(dict.fromkeys(hashes))
+        found = {}
+        with self._lock:
+            for start in range(0, len(unique), _MAX_QUERY_PARAMS):
+                batch = unique[start:start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    [model, *batch]
+                )
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]], model: str) -> None:
+        """Store vectors as float32 blobs."""
+        rows = [(key, model, array("f", vec).tobytes()) for key, vec in items]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, model, vec) VALUES (?, ?, ?)",
+                rows
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+@lru_cache(maxsize=None)
+def get_embedding_cache(path: Optional[str] = None) -> EmbeddingCache:
+    """Return the process-wide cache for a path, opening it on first use."""
+    return EmbeddingCache(path)
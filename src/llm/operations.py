@@ -1,53 +1,350 @@
 from langchain_ollama import OllamaLLM
 from langchain_ollama import OllamaEmbeddings
 from langchain.prompts import PromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import Runnable, RunnableConfig, RunnablePassthrough
 from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Neo4jVector
 from langchain.embeddings.base import Embeddings
 from langchain.llms.base import LLM
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from functools import cached_property, lru_cache
 import os
 from dotenv import load_dotenv
 from langchain_community.llms import Ollama
 from langchain_community.embeddings import OllamaEmbeddings
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
 from langchain_core.output_parsers import StrOutputParser
 import json
+import logging
+import re
+import string
+import orjson
+import asyncio
+import aiohttp
+import requests
 
-from ..models.domain import LegalCase, DocumentType, ActivityType, DisbursementType
+from ..models.domain import LegalCase, DocumentType, ACTIVITY_TYPES_STR, DISBURSEMENT_TYPES_STR
+from .embedding_cache import get_embedding_cache, text_hash
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "32"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("OLLAMA_EMBED_MAX_CONC", "4"))
+
+def _in_event_loop() -> bool:
+    """True when called from a thread that is already running an asyncio loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+_JSON_FENCE_PATTERN = re.compile(r"```(?:json)?", re.IGNORECASE)
+
+def _strip_json_wrapping(response: str) -> str:
+    """Trim markdown fences and surrounding prose from an LLM JSON response."""
+    response = _JSON_FENCE_PATTERN.sub("", response)
+    start = response.find("{")
+    end = response.rfind("}")
+    if start != -1 and end > start:
+        return response[start:end + 1]
+    return response.strip()
+
+CHUNK_SIZE_TOKENS = int(os.getenv("CHUNK_SIZE", "600"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP", "100"))
+GENERATION_MAX_CONCURRENCY = int(os.getenv("OLLAMA_GENERATE_MAX_CONC", "2"))
+
+# Shared HTTP session so batch embedding requests reuse the keep-alive connection
+_http_session = requests.Session()
+
+class _BatchOllamaEmbeddings(OllamaEmbeddings):
+    """OllamaEmbeddings that embeds a whole batch with one call to /api/embed."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        try:
+            response = _http_session.post(
+                f"{self.base_url}/api/embed",
+                json={"model": self.model, "input": texts}
+            )
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings")
+        except (requests.RequestException, ValueError):
+            embeddings = None
+        # Older Ollama servers lack /api/embed; fall back to one request per text
+        if not embeddings or len(embeddings) != len(texts):
+            return super().embed_documents(texts)
+        return embeddings
+
+@lru_cache(maxsize=1024)
+def _cached_embed_query(model: str, base_url: str, text: str) -> Tuple[float, ...]:
+    """Embed a query string, memoized in-process on top of the persistent cache."""
+    cache = get_embedding_cache()
+    # Query embeddings use a different instruction prefix, so keep them apart
+    cache_model = f"{model}#query"
+    key = text_hash(text)
+    cached = cache.get_many([key], cache_model)
+    if key in cached:
+        return tuple(cached[key])
+    embedding = _BatchOllamaEmbeddings(model=model, base_url=base_url).embed_query(text)
+    cache.put_many([(key, embedding)], cache_model)
+    return tuple(embedding)
+
+def clear_embedding_cache() -> None:
+    """Drop in-process query embeddings, e.g. after switching embedding model."""
+    _cached_embed_query.cache_clear()
+
+class _DynamicTemplate(Runnable[Dict[str, Any], str]):
+    """Prompt template rendered with str.format_map, skipping PromptTemplate validation."""
+
+    def __init__(self, template: str):
+        self.template = template
+        self.input_variables = sorted(
+            {name for _, name, _, _ in string.Formatter().parse(template) if name}
+        )
+
+    def render(self, data: Dict[str, Any]) -> str:
+        return self.template.format_map(data)
+
+    def invoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> str:
+        return self.render(input)
+
+# Document generation prompts, built once at import
+_BILL_OF_COSTS_PROMPT = _DynamicTemplate("""
+    Generate a Bill of Costs for the following case:
+
+    Case Reference: {case_reference}
+    Case Title: {case_title}
+    Court: {court}
+
+    Work Items:
+    {work_items}
+
+    Disbursements:
+    {disbursements}
+
+    Please format the Bill of Costs according to standard UK legal practice, including:
+    1. Case details and court information
+    2. Chronological list of work items with dates, descriptions, time spent, and amounts
+    3. List of disbursements
+    4. Summary of costs
+    5. VAT calculations if applicable
+
+    Format the output in a clear, professional manner suitable for court submission.
+    """)
+
+_SCHEDULE_OF_COSTS_PROMPT = _DynamicTemplate("""
+    Generate a Schedule of Costs for the following case:
+
+    Case Reference: {case_reference}
+    Case Title: {case_title}
+    Court: {court}
+
+    Work Items:
+    {work_items}
+
+    Disbursements:
+    {disbursements}
+
+    Please format the Schedule of Costs according to standard UK legal practice, including:
+    1. Case details
+    2. Summary of costs by category
+    3. Breakdown of work items
+    4. Breakdown of disbursements
+    5. Total costs
+
+    Format the output in a clear, professional manner suitable for court submission.
+    """)
+
+_POINTS_OF_DISPUTE_PROMPT = _DynamicTemplate("""
+    Generate Points of Dispute for the following case:
+
+    Case Reference: {case_reference}
+    Case Title: {case_title}
+    Court: {court}
+
+    Work Items:
+    {work_items}
+
+    Disbursements:
+    {disbursements}
+
+    Please format the Points of Dispute according to standard UK legal practice, including:
+    1. Introduction and case details
+    2. Specific points of dispute for each work item or category
+    3. Justification for each point of dispute
+    4. Alternative figures proposed where applicable
+    5. Conclusion
+
+    Format the output in a clear, professional manner suitable for court submission.
+    """)
+
+_POINTS_OF_REPLY_PROMPT = _DynamicTemplate("""
+    Generate Points of Reply for the following case:
+
+    Case Reference: {case_reference}
+    Case Title: {case_title}
+    Court: {court}
+
+    Work Items:
+    {work_items}
+
+    Disbursements:
+    {disbursements}
+
+    Please format the Points of Reply according to standard UK legal practice, including:
+    1. Introduction and case details
+    2. Response to each point of dispute
+    3. Justification for the original figures
+    4. Supporting arguments and evidence
+    5. Conclusion
+
+    Format the output in a clear, professional manner suitable for court submission.
+    """)
+
+# Fields of each entry serialized into the prompt
+_WORK_ITEM_PROMPT_FIELDS = {"date_of_work", "description", "time_spent_units", "claimed_amount_gbp"}
+_DISBURSEMENT_PROMPT_FIELDS = {"date_incurred", "description", "amount_net_gbp", "vat_gbp", "amount_gross_gbp"}
+
+_PROMPTS = {
+    DocumentType.BILL_OF_COSTS_DRAFT: _BILL_OF_COSTS_PROMPT,
+    DocumentType.BILL_OF_COSTS_FINAL: _BILL_OF_COSTS_PROMPT,
+    DocumentType.SCHEDULE_OF_COSTS: _SCHEDULE_OF_COSTS_PROMPT,
+    DocumentType.POINTS_OF_DISPUTE: _POINTS_OF_DISPUTE_PROMPT,
+    DocumentType.REPLIES_TO_POD: _POINTS_OF_REPLY_PROMPT,
+}
+
+# Documents making up a full cost-assessment pack
+COSTS_PACK_DOCUMENT_TYPES = (
+    DocumentType.BILL_OF_COSTS_DRAFT,
+    DocumentType.SCHEDULE_OF_COSTS,
+    DocumentType.POINTS_OF_DISPUTE,
+    DocumentType.REPLIES_TO_POD,
+)
+
 class LLMOperations:
     def __init__(self):
-        """Initialize LLM operations with Ollama."""
-        self.llm = OllamaLLM(
+        """Initialize LLM operations with Ollama.
+
+        Clients are built lazily on first use so that importing or constructing
+        this class does not pay for connections it may never need.
+        """
+        self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.embedding_cache = get_embedding_cache()
+
+    @cached_property
+    def llm(self) -> OllamaLLM:
+        return OllamaLLM(
             model="mistral",
-            base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+            base_url=self.base_url
         )
-        
-        self.embeddings = OllamaEmbeddings(
+
+    @cached_property
+    def embeddings(self) -> _BatchOllamaEmbeddings:
+        return _BatchOllamaEmbeddings(
             model="nomic-embed-text",
-            base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+            base_url=self.base_url
         )
-        
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
+
+    @cached_property
+    def text_splitter(self) -> RecursiveCharacterTextSplitter:
+        # Sized in tokens, which is what the embedding and chat models are limited by
+        return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            encoding_name="cl100k_base",
+            chunk_size=CHUNK_SIZE_TOKENS,
+            chunk_overlap=CHUNK_OVERLAP_TOKENS,
             is_separator_regex=False
         )
+
+    @cached_property
+    def _chains(self) -> Dict[DocumentType, Runnable]:
+        """One LCEL pipeline per document type, reused across calls."""
+        return {
+            doc_type: prompt | self.llm | StrOutputParser()
+            for doc_type, prompt in _PROMPTS.items()
+        }
+
+    @cached_property
+    def _default_chain(self) -> Runnable:
+        return _POINTS_OF_REPLY_PROMPT | self.llm | StrOutputParser()
     
+    def warm(self) -> None:
+        """Build the lazily-created clients and chains ahead of first use."""
+        for name in ("llm", "embeddings", "text_splitter", "_chains"):
+            getattr(self, name)
+
     def split_text(self, text: str) -> List[str]:
         """Split text into chunks."""
         return self.text_splitter.split_text(text)
     
     def create_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Create embeddings for a list of texts."""
-        return self.embeddings.embed_documents(texts)
+        """Create embeddings for a list of texts, reusing cached vectors where possible."""
+        model = self.embeddings.model
+        hashes = [text_hash(text) for text in texts]
+        vectors = self.embedding_cache.get_many(hashes, model)
+        # Identical chunks (headers, footers, boilerplate) are embedded once and fanned back out
+        missing: Dict[str, str] = {}
+        for key, text in zip(hashes, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        if missing:
+            fresh = self._embed_texts(list(missing.values()))
+            new_items = list(zip(missing.keys(), fresh))
+            self.embedding_cache.put_many(new_items, model)
+            vectors.update(new_items)
+        return [vectors[key] for key in hashes]
+
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts against the Ollama server, bypassing the cache."""
+        if len(texts) <= EMBED_BATCH_SIZE:
+            return self.embeddings.embed_documents(texts)
+        if _in_event_loop():
+            # asyncio.run can't nest; async callers should await acreate_embeddings
+            embeddings = []
+            for start in range(0, len(texts), EMBED_BATCH_SIZE):
+                embeddings.extend(self.embeddings.embed_documents(texts[start:start + EMBED_BATCH_SIZE]))
+            return embeddings
+        return asyncio.run(self.acreate_embeddings(texts))
+
+    async def acreate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrency: int = EMBED_MAX_CONCURRENCY
+    ) -> List[List[float]]:
+        """Create embeddings in length-sorted mini-batches with bounded concurrency."""
+        # Group similarly sized texts so each batch pads/tokenizes evenly
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        url = f"{self.embeddings.base_url}/api/embed"
+
+        async def embed_batch(session: aiohttp.ClientSession, indices: List[int]) -> List[List[float]]:
+            batch = [texts[i] for i in indices]
+            async with semaphore:
+                try:
+                    async with session.post(url, json={"model": self.embeddings.model, "input": batch}) as response:
+                        response.raise_for_status()
+                        embeddings = (await response.json()).get("embeddings")
+                except (aiohttp.ClientError, ValueError):
+                    embeddings = None
+                if not embeddings or len(embeddings) != len(batch):
+                    embeddings = await asyncio.to_thread(self.embeddings.embed_documents, batch)
+            return embeddings
+
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.gather(*(embed_batch(session, indices) for indices in batches))
+
+        # Reassemble in the caller's original order
+        ordered: List[Optional[List[float]]] = [None] * len(texts)
+        for indices, embeddings in zip(batches, results):
+            for i, embedding in zip(indices, embeddings):
+                ordered[i] = embedding
+        return ordered
     
     def extract_entities(self, text: str) -> Dict[str, Any]:
         """Extract entities from text using LLM."""
@@ -131,29 +428,26 @@ class LLMOperations:
             """
         )
         
-        # Get valid enum values
-        activity_types = [t.value for t in ActivityType]
-        disbursement_types = [t.value for t in DisbursementType]
-        
         chain = prompt | self.llm | StrOutputParser()
         
         try:
             result = chain.invoke({
                 "text": text,
-                "activity_types": ", ".join(activity_types),
-                "disbursement_types": ", ".join(disbursement_types)
+                "activity_types": ACTIVITY_TYPES_STR,
+                "disbursement_types": DISBURSEMENT_TYPES_STR
             })
-            return json.loads(result)
-        except json.JSONDecodeError as e:
-            print(f"Error parsing LLM response: {e}")
-            print(f"Raw response: {result}")
+            return orjson.loads(_strip_json_wrapping(result))
+        except orjson.JSONDecodeError:
+            logger.exception("LLM JSON parse failed")
+            # Truncated so multi-KB responses don't flood the log
+            logger.debug("Raw response: %s", result[:1000])
             return {
                 "case_info": {},
                 "work_items": [],
                 "disbursements": []
             }
-        except Exception as e:
-            print(f"Error in entity extraction: {e}")
+        except Exception:
+            logger.exception("Error in entity extraction")
             return {
                 "case_info": {},
                 "work_items": [],
@@ -162,180 +456,68 @@ class LLMOperations:
 
     def get_embedding(self, text: str) -> List[float]:
         """Get embedding for a text string."""
-        return self.embeddings.embed_query(text)
+        return list(_cached_embed_query(self.embeddings.model, self.embeddings.base_url, text))
 
     def generate_document(self, case: LegalCase, doc_type: DocumentType) -> str:
         """Generate a legal document using LLM."""
-        # Construct prompt based on document type
-        if doc_type == DocumentType.BILL_OF_COSTS:
-            prompt = self._get_bill_of_costs_prompt()
-        elif doc_type == DocumentType.SCHEDULE_OF_COSTS:
-            prompt = self._get_schedule_of_costs_prompt()
-        elif doc_type == DocumentType.POINTS_OF_DISPUTE:
-            prompt = self._get_points_of_dispute_prompt()
-        else:
-            prompt = self._get_points_of_reply_prompt()
-
-        chain = LLMChain(
-            llm=self.llm,
-            prompt=prompt,
-            output_parser=StrOutputParser()
+        return "".join(self.generate_document_stream(case, doc_type))
+
+    def generate_all_documents(
+        self,
+        case: LegalCase,
+        doc_types: Optional[List[DocumentType]] = None,
+        max_concurrency: int = GENERATION_MAX_CONCURRENCY
+    ) -> Dict[DocumentType, str]:
+        """Generate several document types for a case concurrently."""
+        if _in_event_loop():
+            # asyncio.run can't nest; async callers should await agenerate_all_documents
+            doc_types = list(doc_types or COSTS_PACK_DOCUMENT_TYPES)
+            return {doc_type: self.generate_document(case, doc_type) for doc_type in doc_types}
+        return asyncio.run(self.agenerate_all_documents(case, doc_types, max_concurrency))
+
+    async def agenerate_all_documents(
+        self,
+        case: LegalCase,
+        doc_types: Optional[List[DocumentType]] = None,
+        max_concurrency: int = GENERATION_MAX_CONCURRENCY
+    ) -> Dict[DocumentType, str]:
+        """Generate several document types concurrently, bounded to spare the local GPU."""
+        doc_types = list(doc_types or COSTS_PACK_DOCUMENT_TYPES)
+        case_data = self._build_case_data(case)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(doc_type: DocumentType) -> str:
+            async with semaphore:
+                chain = self._chains.get(doc_type, self._default_chain)
+                return await chain.ainvoke(case_data)
+
+        results = await asyncio.gather(*(generate(doc_type) for doc_type in doc_types))
+        return dict(zip(doc_types, results))
+
+    def generate_document_stream(self, case: LegalCase, doc_type: DocumentType) -> Iterator[str]:
+        """Generate a legal document, yielding text chunks as the LLM produces them."""
+        chain = self._chains.get(doc_type, self._default_chain)
+        yield from chain.stream(self._build_case_data(case))
+
+    def _build_case_data(self, case: LegalCase) -> Dict[str, Any]:
+        """Prepare case data for the document prompts."""
+        items = case.model_dump(
+            mode="json",
+            include={
+                "work_items": {"__all__": _WORK_ITEM_PROMPT_FIELDS},
+                "disbursements": {"__all__": _DISBURSEMENT_PROMPT_FIELDS}
+            }
         )
-
-        # Prepare case data for the prompt
-        case_data = {
-            "case_reference": case.reference,
-            "case_title": case.title,
-            "court": case.court or "Not specified",
-            "work_items": [
-                {
-                    "date": item.date.strftime("%Y-%m-%d"),
-                    "description": item.description,
-                    "time_spent": f"{item.time_spent_units} units",
-                    "amount": f"£{item.amount:.2f}"
-                }
-                for item in case.work_items
-            ],
-            "disbursements": [
-                {
-                    "date": d.date.strftime("%Y-%m-%d"),
-                    "description": d.description,
-                    "amount": f"£{d.amount:.2f}"
-                }
-                for d in case.disbursements
-            ]
+        return {
+            "case_reference": case.case_reference_number,
+            "case_title": case.case_name,
+            "court": case.court_claim_number or "Not specified",
+            # Serialized in C by Pydantic/orjson rather than formatted per item in Python
+            "work_items": orjson.dumps(items["work_items"]).decode(),
+            "disbursements": orjson.dumps(items["disbursements"]).decode()
         }
 
-        return chain.invoke(case_data)
-
-    def _get_bill_of_costs_prompt(self) -> PromptTemplate:
-        return PromptTemplate(
-            input_variables=[
-                "case_reference",
-                "case_title",
-                "court",
-                "work_items",
-                "disbursements"
-            ],
-            template="""
-            Generate a Bill of Costs for the following case:
-
-            Case Reference: {case_reference}
-            Case Title: {case_title}
-            Court: {court}
-
-            Work Items:
-            {work_items}
-
-            Disbursements:
-            {disbursements}
-
-            Please format the Bill of Costs according to standard UK legal practice, including:
-            1. Case details and court information
-            2. Chronological list of work items with dates, descriptions, time spent, and amounts
-            3. List of disbursements
-            4. Summary of costs
-            5. VAT calculations if applicable
-
-            Format the output in a clear, professional manner suitable for court submission.
-            """
-        )
-
-    def _get_schedule_of_costs_prompt(self) -> PromptTemplate:
-        return PromptTemplate(
-            input_variables=[
-                "case_reference",
-                "case_title",
-                "court",
-                "work_items",
-                "disbursements"
-            ],
-            template="""
-            Generate a Schedule of Costs for the following case:
-
-            Case Reference: {case_reference}
-            Case Title: {case_title}
-            Court: {court}
-
-            Work Items:
-            {work_items}
-
-            Disbursements:
-            {disbursements}
-
-            Please format the Schedule of Costs according to standard UK legal practice, including:
-            1. Case details
-            2. Summary of costs by category
-            3. Breakdown of work items
-            4. Breakdown of disbursements
-            5. Total costs
-
-            Format the output in a clear, professional manner suitable for court submission.
-            """
-        )
-
-    def _get_points_of_dispute_prompt(self) -> PromptTemplate:
-        return PromptTemplate(
-            input_variables=[
-                "case_reference",
-                "case_title",
-                "court",
-                "work_items",
-                "disbursements"
-            ],
-            template="""
-            Generate Points of Dispute for the following case:
-
-            Case Reference: {case_reference}
-            Case Title: {case_title}
-            Court: {court}
-
-            Work Items:
-            {work_items}
-
-            Disbursements:
-            {disbursements}
-
-            Please format the Points of Dispute according to standard UK legal practice, including:
-            1. Introduction and case details
-            2. Specific points of dispute for each work item or category
-            3. Justification for each point of dispute
-            4. Alternative figures proposed where applicable
-            5. Conclusion
-
-            Format the output in a clear, professional manner suitable for court submission.
-            """
-        )
-
-    def _get_points_of_reply_prompt(self) -> PromptTemplate:
-        return PromptTemplate(
-            input_variables=[
-                "case_reference",
-                "case_title",
-                "court",
-                "work_items",
-                "disbursements"
-            ],
-            template="""
-            Generate Points of Reply for the following case:
-
-            Case Reference: {case_reference}
-            Case Title: {case_title}
-            Court: {court}
-
-            Work Items:
-            {work_items}
-
-            Disbursements:
-            {disbursements}
-
-            Please format the Points of Reply according to standard UK legal practice, including:
-            1. Introduction and case details
-            2. Response to each point of dispute
-            3. Justification for the original figures
-            4. Supporting arguments and evidence
-            5. Conclusion
-
-            Format the output in a clear, professional manner suitable for court submission.
-            """
-        ) 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_llm_operations() -> LLMOperations:
+    """Return the process-wide LLMOperations so its clients and connection pools are shared."""
+    return LLMOperations()
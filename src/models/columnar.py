@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+from .domain import WorkItem, Disbursement, WorkActivityType, DisbursementType
+from .totals import sum_recoverable
+
+# Stable integer codes for the enum columns
+_ACTIVITY_CODES = {member: code for code, member in enumerate(WorkActivityType)}
+_DISBURSEMENT_CODES = {member: code for code, member in enumerate(DisbursementType)}
+
+_EPOCH = date(1970, 1, 1)
+
+# Date column value for a missing date; sorts before every real date, so
+# in_period never matches it
+NO_DATE = np.iinfo(np.int32).min
+
+def _to_pence(amounts: np.ndarray) -> np.ndarray:
+    return np.rint(amounts * 100).astype(np.int64)
+
+def _to_epoch_days(dates: List[Any]) -> np.ndarray:
+    parsed = np.array(dates, dtype="datetime64[D]")
+    # NaT would otherwise cast to an arbitrary int32, e.g. 0 (1970-01-01)
+    return np.where(np.isnat(parsed), NO_DATE, parsed.astype(np.int64)).astype(np.int32)
+
+def to_epoch_day(value: date) -> int:
+    """Days since 1970-01-01, the encoding used by the date columns."""
+    return (value - _EPOCH).days
+
+def to_date(epoch_day: int) -> Optional[date]:
+    """Decode an epoch-day column value back to a date, or None for NO_DATE."""
+    if epoch_day == NO_DATE:
+        return None
+    return _EPOCH + timedelta(days=int(epoch_day))
+
+class WorkItemTable:
+    """Column-oriented view of a case's work items for bill aggregation."""
+
+    def __init__(self, amount_pence: np.ndarray, is_recoverable: np.ndarray,
+                 activity_type: np.ndarray, date_of_work: np.ndarray):
+        self.amount_pence = amount_pence
+        self.is_recoverable = is_recoverable
+        self.activity_type = activity_type
+        self.date_of_work = date_of_work
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "WorkItemTable":
+        """Build from work item dicts (e.g. WorkItem.model_dump() output or Neo4j rows)."""
+        n = len(records)
+        claimed = np.fromiter((r.get("claimed_amount_gbp") or 0.0 for r in records), np.float64, n)
+        hours = np.fromiter((r.get("time_spent_decimal_hours") or 0.0 for r in records), np.float64, n)
+        rate = np.fromiter((r.get("applicable_hourly_rate_gbp") or 0.0 for r in records), np.float64, n)
+        # Same rule as the bill line amount: claimed amount, else hours x rate
+        amount = np.where(claimed != 0.0, claimed, hours * rate)
+        return cls(
+            amount_pence=_to_pence(amount),
+            is_recoverable=np.fromiter((r.get("is_recoverable", True) is not False for r in records), np.bool_, n),
+            activity_type=np.fromiter(
+                (_ACTIVITY_CODES.get(r.get("activity_type"), -1) for r in records), np.int8, n
+            ),
+            date_of_work=_to_epoch_days([r.get("date_of_work") for r in records]),
+        )
+
+    @classmethod
+    def from_work_items(cls, work_items: List[WorkItem]) -> "WorkItemTable":
+        return cls.from_records([item.__dict__ for item in work_items])
+
+    def total_pence(self) -> int:
+        return int(self.amount_pence.sum())
+
+    def recoverable_pence(self) -> int:
+        return sum_recoverable(self.amount_pence, self.is_recoverable)
+
+    def has_date(self) -> np.ndarray:
+        """Mask of rows with a known date of work."""
+        return self.date_of_work != NO_DATE
+
+    def in_period(self, start: date, end: date) -> np.ndarray:
+        """Mask of rows whose date of work falls within [start, end]."""
+        return (self.date_of_work >= to_epoch_day(start)) & (self.date_of_work <= to_epoch_day(end))
+
+class DisbursementTable:
+    """Column-oriented view of a case's disbursements for bill aggregation."""
+
+    def __init__(self, amount_pence: np.ndarray, is_recoverable: np.ndarray,
+                 disbursement_type: np.ndarray, date_incurred: np.ndarray):
+        self.amount_pence = amount_pence
+        self.is_recoverable = is_recoverable
+        self.disbursement_type = disbursement_type
+        self.date_incurred = date_incurred
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "DisbursementTable":
+        """Build from disbursement dicts (e.g. Disbursement.model_dump() output or Neo4j rows)."""
+        n = len(records)
+        gross = np.fromiter((r.get("amount_gross_gbp") or 0.0 for r in records), np.float64, n)
+        net = np.fromiter((r.get("amount_net_gbp") or 0.0 for r in records), np.float64, n)
+        vat = np.fromiter((r.get("vat_gbp") or 0.0 for r in records), np.float64, n)
+        # Same rule as the bill line amount: gross amount, else net + VAT
+        amount = np.where(gross != 0.0, gross, net + vat)
+        return cls(
+            amount_pence=_to_pence(amount),
+            is_recoverable=np.fromiter((r.get("is_recoverable", True) is not False for r in records), np.bool_, n),
+            disbursement_type=np.fromiter(
+                (_DISBURSEMENT_CODES.get(r.get("disbursement_type"), -1) for r in records), np.int8, n
+            ),
+            date_incurred=_to_epoch_days([r.get("date_incurred") for r in records]),
+        )
+
+    @classmethod
+    def from_disbursements(cls, disbursements: List[Disbursement]) -> "DisbursementTable":
+        return cls.from_records([item.__dict__ for item in disbursements])
+
+    def total_pence(self) -> int:
+        return int(self.amount_pence.sum())
+
+    def recoverable_pence(self) -> int:
+        return sum_recoverable(self.amount_pence, self.is_recoverable)
+
+    def has_date(self) -> np.ndarray:
+        """Mask of rows with a known date incurred."""
+        return self.date_incurred != NO_DATE
+
+    def in_period(self, start: date, end: date) -> np.ndarray:
+        """Mask of rows whose date incurred falls within [start, end]."""
+        return (self.date_incurred >= to_epoch_day(start)) & (self.date_incurred <= to_epoch_day(end))
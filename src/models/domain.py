@@ -1,15 +1,46 @@
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime
 from enum import Enum
-from pydantic import BaseModel, Field, HttpUrl, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, EmailStr, model_validator
+import math
 import uuid
 import re
+import os
+import string
+
+from .fastuuid import fast_uuid4
 
 # Email validation pattern
 EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+_EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-")
+_EMAIL_HOST_CHARS = frozenset(string.ascii_letters + string.digits + ".-")
+_EMAIL_TLD_CHARS = frozenset(string.ascii_letters)
+
+# Set to fall back to the EMAIL_PATTERN regex instead of the manual scan
+USE_REGEX_EMAIL_VALIDATION = os.getenv("USE_REGEX_EMAIL_VALIDATION", "").lower() in ("1", "true")
 
 def validate_email(email: str) -> bool:
-    return bool(re.match(EMAIL_PATTERN, email))
+    """Check an address against EMAIL_PATTERN without running the regex engine."""
+    if USE_REGEX_EMAIL_VALIDATION:
+        return _EMAIL_RE.fullmatch(email) is not None
+    local, sep, domain = email.partition("@")
+    if not sep or not local:
+        return False
+    host, dot, tld = domain.rpartition(".")
+    return (
+        bool(dot and host)
+        and len(tld) >= 2
+        and _EMAIL_LOCAL_CHARS.issuperset(local)
+        and _EMAIL_HOST_CHARS.issuperset(host)
+        and _EMAIL_TLD_CHARS.issuperset(tld)
+    )
+
+def normalize_embedding(embedding: List[float]) -> List[float]:
+    """Scale an embedding to unit L2 length (zero vectors are returned unchanged)."""
+    norm = math.sqrt(sum(value * value for value in embedding))
+    return [value / norm for value in embedding] if norm else list(embedding)
 
 # --- Enums for controlled vocabularies ---
 
@@ -118,15 +149,31 @@ class ActivityType(str, Enum):
     WAITING = "Waiting"
     REPORTING = "Reporting"
 
+# Valid enum values as listed in the LLM extraction prompts; the enums never change at runtime
+ACTIVITY_TYPES_STR = ", ".join(t.value for t in ActivityType)
+DISBURSEMENT_TYPES_STR = ", ".join(t.value for t in DisbursementType)
+
 # --- Core Data Models ---
 
-class EntityReference(BaseModel):
-    entity_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class DomainModel(BaseModel):
+    @classmethod
+    def from_neo4j_record(cls, record: Dict[str, Any]):
+        """Build a model from a trusted Neo4j record, skipping validation.
+
+        Callers are responsible for converting Neo4j temporal types, UUID
+        strings and enum values to their Python types first.
+        """
+        return cls.model_construct(**record)
+
+class EntityReference(DomainModel):
+    entity_id: uuid.UUID = Field(default_factory=fast_uuid4)
     entity_type: str
     display_name: Optional[str] = None
 
-class DocumentChunk(BaseModel):
-    chunk_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class DocumentChunk(DomainModel):
+    model_config = ConfigDict(frozen=True)
+
+    chunk_id: uuid.UUID = Field(default_factory=fast_uuid4)
     source_document_id: uuid.UUID
     text_content: str
     page_number_start: Optional[int] = None
@@ -134,8 +181,8 @@ class DocumentChunk(BaseModel):
     embedding: Optional[List[float]] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
-class SourceDocument(BaseModel):
-    document_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class SourceDocument(DomainModel):
+    document_id: uuid.UUID = Field(default_factory=fast_uuid4)
     case_id: uuid.UUID
     file_name: Optional[str] = None
     file_path: Optional[str] = None
@@ -147,8 +194,8 @@ class SourceDocument(BaseModel):
     extracted_text_path: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
-class Party(BaseModel):
-    party_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class Party(DomainModel):
+    party_id: uuid.UUID = Field(default_factory=fast_uuid4)
     case_id: uuid.UUID
     name: str
     role: PartyRole
@@ -158,8 +205,8 @@ class Party(BaseModel):
     address: Optional[str] = None
     is_client_party: bool = False
 
-class FeeEarner(BaseModel):
-    fe_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class FeeEarner(DomainModel):
+    fe_id: uuid.UUID = Field(default_factory=fast_uuid4)
     firm_id: uuid.UUID
     name: str
     role_at_firm: str
@@ -167,8 +214,8 @@ class FeeEarner(BaseModel):
     experience_years: Optional[int] = None
     default_hourly_rate_gbp: Optional[float] = None
 
-class AgreedRate(BaseModel):
-    rate_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class AgreedRate(DomainModel):
+    rate_id: uuid.UUID = Field(default_factory=fast_uuid4)
     applicable_to_entity_id: uuid.UUID
     fee_earner_grade: Optional[FeeEarnerGrade] = None
     specific_fee_earner_id: Optional[uuid.UUID] = None
@@ -178,8 +225,10 @@ class AgreedRate(BaseModel):
     effective_to: Optional[date] = None
     notes: Optional[str] = None
 
-class WorkItem(BaseModel):
-    work_item_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class WorkItem(DomainModel):
+    model_config = ConfigDict(frozen=True)
+
+    work_item_id: uuid.UUID = Field(default_factory=fast_uuid4)
     case_id: uuid.UUID
     fee_earner_id: Optional[uuid.UUID] = None
     date_of_work: date
@@ -196,8 +245,10 @@ class WorkItem(BaseModel):
     disputed: bool = False
     dispute_reason: Optional[str] = None
 
-class Disbursement(BaseModel):
-    disbursement_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class Disbursement(DomainModel):
+    model_config = ConfigDict(frozen=True)
+
+    disbursement_id: uuid.UUID = Field(default_factory=fast_uuid4)
     case_id: uuid.UUID
     date_incurred: date
     disbursement_type: DisbursementType
@@ -212,23 +263,23 @@ class Disbursement(BaseModel):
     disputed: bool = False
     dispute_reason: Optional[str] = None
 
-class Counsel(BaseModel):
-    counsel_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class Counsel(DomainModel):
+    counsel_id: uuid.UUID = Field(default_factory=fast_uuid4)
     name: str
     chambers_name: Optional[str] = None
     call_date: Optional[date] = None
     is_kc: bool = False
     contact_email: Optional[str] = Field(None, pattern=EMAIL_PATTERN)
 
-class Expert(BaseModel):
-    expert_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class Expert(DomainModel):
+    expert_id: uuid.UUID = Field(default_factory=fast_uuid4)
     name: str
     field_of_expertise: str
     organisation_name: Optional[str] = None
     contact_email: Optional[str] = Field(None, pattern=EMAIL_PATTERN)
 
-class CourtDetails(BaseModel):
-    court_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class CourtDetails(DomainModel):
+    court_id: uuid.UUID = Field(default_factory=fast_uuid4)
     name: str
     address: Optional[str] = None
     is_county_court: bool = False
@@ -238,8 +289,8 @@ class CourtDetails(BaseModel):
     is_tribunal: bool = False
     tribunal_name: Optional[str] = None
 
-class Retainer(BaseModel):
-    retainer_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class Retainer(DomainModel):
+    retainer_id: uuid.UUID = Field(default_factory=fast_uuid4)
     case_id: uuid.UUID
     retainer_type: RetainerType
     date_signed: Optional[date] = None
@@ -248,8 +299,8 @@ class Retainer(BaseModel):
     hourly_rate_schedule_description: Optional[str] = None
     notes: Optional[str] = None
 
-class LawFirm(BaseModel):
-    firm_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class LawFirm(DomainModel):
+    firm_id: uuid.UUID = Field(default_factory=fast_uuid4)
     name: str
     sra_number: Optional[str] = None
     address: Optional[str] = None
@@ -257,8 +308,8 @@ class LawFirm(BaseModel):
     contact_email: Optional[str] = Field(None, pattern=EMAIL_PATTERN)
     website: Optional[HttpUrl] = None
 
-class LegalCase(BaseModel):
-    case_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class LegalCase(DomainModel):
+    case_id: uuid.UUID = Field(default_factory=fast_uuid4)
     case_reference_number: str
     case_name: str
     court_claim_number: Optional[str] = None
@@ -282,9 +333,11 @@ class LegalCase(BaseModel):
     schedule_of_costs_ids: List[uuid.UUID] = Field(default_factory=list)
     precedent_h_ids: List[uuid.UUID] = Field(default_factory=list)
 
-class BillItem(BaseModel):
-    item_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    date: datetime
+class BillItem(DomainModel):
+    model_config = ConfigDict(frozen=True)
+
+    item_id: str = Field(default_factory=lambda: str(fast_uuid4()))
+    date: date
     description: str
     time_spent_units: Optional[int] = None
     time_spent_decimal_hours: Optional[float] = None
@@ -292,13 +345,20 @@ class BillItem(BaseModel):
     amount: float
     is_recoverable: bool = True
 
-class BillSection(BaseModel):
-    section_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    @property
+    def amount_pence(self) -> int:
+        """Amount in integer pence, for exact and fast totalling."""
+        return round(self.amount * 100)
+
+class BillSection(DomainModel):
+    model_config = ConfigDict(frozen=True)
+
+    section_id: str = Field(default_factory=lambda: str(fast_uuid4()))
     title: str
     items: List[BillItem]
 
-class Bill(BaseModel):
-    bill_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+class Bill(DomainModel):
+    bill_id: uuid.UUID = Field(default_factory=fast_uuid4)
     case_id: uuid.UUID
     case_name: str
     date_generated: datetime
@@ -306,16 +366,8 @@ class Bill(BaseModel):
     total_amount: float
     recoverable_amount: float
 
-    @validator('recoverable_amount')
-    def validate_recoverable_amount(cls, v, values):
-        if 'total_amount' in values:
-            if v > values['total_amount']:
-                raise ValueError("Recoverable amount cannot exceed total amount")
-        return v
-
-    @validator('total_amount')
-    def validate_total_amount(cls, v, values):
-        if 'recoverable_amount' in values:
-            if v < values['recoverable_amount']:
-                raise ValueError("Total amount cannot be less than recoverable amount")
-        return v 
\ No newline at end of file
+    @model_validator(mode='after')
+    def validate_amounts(self):
+        if self.recoverable_amount > self.total_amount:
+            raise ValueError("Recoverable amount cannot exceed total amount")
+        return self 
\ No newline at end of file
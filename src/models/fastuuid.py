@@ -0,0 +1,28 @@
+import os
+import threading
+import uuid
+
+# Bytes of randomness fetched per os.urandom call (256 UUIDs)
+_POOL_SIZE = 4096
+
+_local = threading.local()
+
+def _reset_after_fork() -> None:
+    # A forked child must not hand out the same UUIDs as its parent
+    global _local
+    _local = threading.local()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def fast_uuid4() -> uuid.UUID:
+    """Return a random (version 4) UUID drawn from a per-thread pool of urandom bytes."""
+    offset = getattr(_local, "offset", _POOL_SIZE)
+    if offset >= _POOL_SIZE:
+        _local.pool = os.urandom(_POOL_SIZE)
+        offset = 0
+    _local.offset = offset + 16
+    raw = bytearray(_local.pool[offset:offset + 16])
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return uuid.UUID(bytes=bytes(raw))
@@ -0,0 +1,24 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to NumPy's reducer
+    njit = None
+
+def _sum_recoverable_numpy(amount: np.ndarray, recoverable: np.ndarray) -> int:
+    return int(amount[recoverable].sum())
+
+if njit is not None:
+    @njit("int64(int64[:], boolean[:])", cache=True)
+    def _sum_recoverable_jit(amount, recoverable):
+        total = 0
+        for i in range(amount.shape[0]):
+            # Branch-free accumulation keeps the loop vectorisable
+            total += amount[i] * recoverable[i]
+        return total
+
+    def sum_recoverable(amount: np.ndarray, recoverable: np.ndarray) -> int:
+        """Sum the pence amounts whose recoverable flag is set."""
+        return int(_sum_recoverable_jit(amount, recoverable))
+else:
+    sum_recoverable = _sum_recoverable_numpy
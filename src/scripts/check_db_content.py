@@ -1,63 +1,70 @@
-from neo4j import GraphDatabase
-import os
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
 
-load_dotenv()
+# Add src directory to Python path
+src_path = str(Path(__file__).parent.parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
 
-def check_database_content():
+from src.graph.driver import get_driver
+
+CONTENT_SUMMARY_QUERY = """
+CALL {
+    MATCH (n)
+    WITH labels(n) as labels, count(*) as count
+    RETURN collect({labels: labels, count: count}) as node_counts
+}
+CALL {
+    MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
+    WITH c.id as case_id,
+         c.title as case_title,
+         count(dc) as chunk_count,
+         collect(distinct dc.source_file) as files
+    RETURN collect({case_id: case_id, case_title: case_title, chunk_count: chunk_count, files: files}) as cases
+}
+CALL {
+    MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
+    WITH c, dc
+    LIMIT $sample_limit
+    RETURN collect({
+        case_id: c.id,
+        file: dc.source_file,
+        page: dc.page,
+        chunk_index: dc.chunk_index,
+        content_preview: substring(dc.content, 0, 100)
+    }) as samples
+}
+RETURN node_counts, cases, samples
+"""
+
+def _fetch_content_summary(tx, sample_limit):
+    return tx.run(CONTENT_SUMMARY_QUERY, sample_limit=sample_limit).single()
+
+def check_database_content(sample_limit: int = 5):
     """Check what content exists in the database."""
-    driver = GraphDatabase.driver(
-        os.getenv("NEO4J_URI", "bolt://localhost:7687"),
-        auth=(os.getenv("NEO4J_USERNAME", "neo4j"), os.getenv("NEO4J_PASSWORD", "password"))
-    )
-
-    try:
-        with driver.session() as session:
-            # Check all nodes
-            result = session.run("""
-                MATCH (n)
-                RETURN labels(n) as labels, count(*) as count
-            """)
-            print("\nNode counts by type:")
-            print("-" * 40)
-            for record in result:
-                print(f"{record['labels']}: {record['count']}")
-
-            # Check document chunks
-            result = session.run("""
-                MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
-                RETURN c.id as case_id, 
-                       c.title as case_title,
-                       count(dc) as chunk_count,
-                       collect(distinct dc.source_file) as files
-            """)
-            print("\nDocument chunks by case:")
-            print("-" * 40)
-            for record in result:
-                print(f"Case {record['case_id']} ({record['case_title']}):")
-                print(f"  Chunks: {record['chunk_count']}")
-                print(f"  Files: {record['files']}")
-
-            # Check a sample of document chunks
-            result = session.run("""
-                MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
-                RETURN c.id as case_id,
-                       dc.source_file as file,
-                       dc.page as page,
-                       dc.chunk_index as chunk_index,
-                       dc.content as content
-                LIMIT 5
-            """)
-            print("\nSample document chunks:")
-            print("-" * 40)
-            for record in result:
-                print(f"Case {record['case_id']}, File: {record['file']}")
-                print(f"Page {record['page']}, Chunk {record['chunk_index']}")
-                print(f"Content: {record['content'][:100]}...")
-                print()
-
-    finally:
-        driver.close()
+    with get_driver().session() as session:
+        # Fetch node counts, per-case chunk counts and a sample in one round-trip
+        summary = session.execute_read(_fetch_content_summary, sample_limit)
+
+    parts = ["", "Node counts by type:", "-" * 40]
+    for record in summary["node_counts"]:
+        parts.append(f"{record['labels']}: {record['count']}")
+
+    parts += ["", "Document chunks by case:", "-" * 40]
+    for record in summary["cases"]:
+        parts.append(f"Case {record['case_id']} ({record['case_title']}):")
+        parts.append(f"  Chunks: {record['chunk_count']}")
+        parts.append(f"  Files: {record['files']}")
+
+    parts += ["", "Sample document chunks:", "-" * 40]
+    for record in summary["samples"]:
+        parts.append(f"Case {record['case_id']}, File: {record['file']}")
+        parts.append(f"Page {record['page']}, Chunk {record['chunk_index']}")
+        parts.append(f"Content: {record['content_preview']}...")
+        parts.append("")
+
+    # Emit the report in a single write rather than one print per line
+    sys.stdout.write("\n".join(parts) + "\n")
 
 if __name__ == "__main__":
     check_database_content() 
\ No newline at end of file
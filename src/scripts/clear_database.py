@@ -1,21 +1,20 @@
-from neo4j import GraphDatabase
-import os
-from dotenv import load_dotenv
-from rich.console import Console
+import sys
+from pathlib import Path
 
-load_dotenv()
-console = Console()
+# Add src directory to Python path
+src_path = str(Path(__file__).parent.parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
 
 def clear_database():
     """Clear all data, indexes, and constraints from the Neo4j database."""
-    # Connect to Neo4j
-    driver = GraphDatabase.driver(
-        os.getenv("NEO4J_URI", "bolt://localhost:7687"),
-        auth=(os.getenv("NEO4J_USERNAME", "neo4j"), os.getenv("NEO4J_PASSWORD", "password"))
-    )
+    # Imported here so a cancelled run never pays for rich/neo4j start-up
+    from rich.console import Console
+    from src.graph.driver import get_driver
 
+    console = Console()
     try:
-        with driver.session() as session:
+        with get_driver().session() as session:
             # Drop all constraints
             console.print("[yellow]Dropping constraints...[/yellow]")
             session.run("""
@@ -60,10 +59,11 @@ def clear_database():
     except Exception as e:
         console.print(f"[red]Error clearing database: {str(e)}[/red]")
         raise
-    finally:
-        driver.close()
 
 if __name__ == "__main__":
+    from rich.console import Console
+
+    console = Console()
     # Ask for confirmation
     console.print("[red]WARNING: This will clear ALL data, indexes, and constraints from the database![/red]")
     response = input("Are you sure you want to proceed? This cannot be undone! (yes/no): ")
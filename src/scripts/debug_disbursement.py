@@ -1,9 +1,14 @@
-from neo4j import GraphDatabase
 import os
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+src_path = str(Path(__file__).parent.parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.graph.driver import get_driver
 
-uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-user = os.getenv("NEO4J_USER", "neo4j")
-password = os.getenv("NEO4J_PASSWORD", "password")
 database = os.getenv("NEO4J_DATABASE", "neo4j")
 
 disbursement_params = {
@@ -24,9 +29,33 @@ disbursement_params = {
     "dispute_reason": None
 }
 
+# One query text for any number of rows, so Neo4j plans it once and reuses the cached plan
+DISBURSEMENT_CYPHER = """
+UNWIND $batch AS row
+MATCH (c:Case {case_id: row.case_id})
+CREATE (d:Disbursement {
+  disbursement_id: row.disbursement_id,
+  case_id: row.case_id,
+  date_incurred: date(row.date_incurred),
+  disbursement_type: row.disbursement_type,
+  status: row.status,
+  description: row.description,
+  payee_name: row.payee_name,
+  amount_net_gbp: row.amount_net_gbp,
+  vat_gbp: row.vat_gbp,
+  amount_gross_gbp: row.amount_gross_gbp,
+  is_recoverable: row.is_recoverable,
+  voucher_document_id: row.voucher_document_id,
+  bill_item_number: row.bill_item_number,
+  disputed: row.disputed,
+  dispute_reason: row.dispute_reason
+})
+CREATE (c)-[:HAS_DISBURSEMENT]->(d)
+RETURN d.disbursement_id as disbursement_id
+"""
+
 def main():
-    driver = GraphDatabase.driver(uri, auth=(user, password))
-    with driver.session(database=database) as session:
+    with get_driver().session(database=database) as session:
         try:
             print("Checking if case exists...")
             case = session.run("MATCH (c:Case {case_id: $case_id}) RETURN c", {"case_id": disbursement_params["case_id"]}).single()
@@ -34,31 +63,7 @@ def main():
                 print("Case not found!")
                 return
             print("Case found. Attempting to create disbursement...")
-            result = session.run(
-                """
-                MATCH (c:Case {case_id: $case_id})
-                CREATE (d:Disbursement {
-                  disbursement_id: $disbursement_id,
-                  case_id: $case_id,
-                  date_incurred: date($date_incurred),
-                  disbursement_type: $disbursement_type,
-                  status: $status,
-                  description: $description,
-                  payee_name: $payee_name,
-                  amount_net_gbp: $amount_net_gbp,
-                  vat_gbp: $vat_gbp,
-                  amount_gross_gbp: $amount_gross_gbp,
-                  is_recoverable: $is_recoverable,
-                  voucher_document_id: $voucher_document_id,
-                  bill_item_number: $bill_item_number,
-                  disputed: $disputed,
-                  dispute_reason: $dispute_reason
-                })
-                CREATE (c)-[:HAS_DISBURSEMENT]->(d)
-                RETURN d.disbursement_id as disbursement_id
-                """,
-                disbursement_params
-            )
+            result = session.run(DISBURSEMENT_CYPHER, {"batch": [disbursement_params]})
             record = result.single()
             if record:
                 print("Disbursement created! ID:", record["disbursement_id"])
@@ -66,8 +71,6 @@ def main():
                 print("No record returned. Disbursement not created.")
         except Exception as e:
             print("Exception occurred:", e)
-        finally:
-            driver.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -13,11 +13,7 @@ src_path = str(Path(__file__).parent.parent.parent)
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from src.models.domain import LegalCase
-from src.document.processor import DocumentProcessor
-from src.graph.operations import Neo4jGraph
-
-app = typer.Typer()
+app = typer.Typer(no_args_is_help=True)
 console = Console()
 
 @app.command()
@@ -29,6 +25,10 @@ def ingest(
     description: str = typer.Option(None, help="Case description"),
 ):
     """Ingest case documents into the system."""
+    # Deferred so --help and argument errors don't load neo4j, pydantic and langchain
+    from src.document_processing.processor import DocumentProcessor
+    from src.graph.operations import Neo4jGraph
+
     try:
         # Initialize components
         graph = Neo4jGraph()
@@ -50,10 +50,10 @@ def ingest(
             task = progress.add_task("[cyan]Processing documents...", total=None)
             
             try:
-                chunks = processor.process_directory(str(documents_dir), case)
+                count = sum(1 for _ in processor.process_directory(str(documents_dir), case))
                 progress.update(task, completed=True)
                 
-                console.print(f"[green]Successfully processed {len(chunks)} document chunks[/green]")
+                console.print(f"[green]Successfully processed {count} documents[/green]")
                 
             except Exception as e:
                 console.print(f"[red]Error processing documents: {e}[/red]")
@@ -1,19 +1,13 @@
 #!/usr/bin/env python3
 import os
-import sys
-from pathlib import Path
 import logging
 import typer
+from dotenv import load_dotenv
 from rich.console import Console
 from neo4j import GraphDatabase
 from neo4j.exceptions import ServiceUnavailable
 
-# Add project root to Python path
-project_root = str(Path(__file__).parent.parent.parent)
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
-from src.graph.operations import Neo4jGraph
+load_dotenv()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,108 +16,145 @@ logger = logging.getLogger(__name__)
 app = typer.Typer()
 console = Console()
 
-def drop_existing_indexes(driver):
+# Must match the embedding model's output size (nomic-embed-text produces 768)
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "768"))
+
+VECTOR_INDEX_TIMEOUT_SECONDS = 300
+
+# Runs a list of schema statements server-side in a single round-trip
+RUN_SCHEMA_BATCH = """
+UNWIND $stmts AS stmt
+CALL apoc.cypher.runSchema(stmt, {}) YIELD value
+RETURN count(*) AS executed
+"""
+
+PROPERTY_INDEXES = [
+    "CREATE INDEX case_reference IF NOT EXISTS FOR (c:Case) ON (c.reference)",
+    "CREATE INDEX case_id IF NOT EXISTS FOR (c:Case) ON (c.id)",
+    "CREATE INDEX work_item_id IF NOT EXISTS FOR (w:WorkItem) ON (w.id)",
+    "CREATE INDEX fee_earner_id IF NOT EXISTS FOR (f:FeeEarner) ON (f.id)",
+    "CREATE INDEX document_chunk_id IF NOT EXISTS FOR (dc:DocumentChunk) ON (dc.id)",
+    # Lookups and listings by file and case title in the verification scripts
+    "CREATE INDEX document_chunk_source_file IF NOT EXISTS FOR (dc:DocumentChunk) ON (dc.source_file)",
+    "CREATE INDEX case_title IF NOT EXISTS FOR (c:Case) ON (c.title)",
+]
+
+CONSTRAINTS = [
+    # Drop existing indexes first to avoid conflicts
+    "DROP INDEX case_id IF EXISTS",
+    "DROP INDEX document_id IF EXISTS",
+    "DROP INDEX chunk_id IF EXISTS",
+    "DROP INDEX work_item_id IF EXISTS",
+    "DROP INDEX disbursement_id IF EXISTS",
+    "DROP INDEX fee_earner_id IF EXISTS",
+    "CREATE CONSTRAINT constraint_case_id IF NOT EXISTS FOR (c:Case) REQUIRE c.id IS UNIQUE",
+    "CREATE CONSTRAINT constraint_document_id IF NOT EXISTS FOR (d:SourceDocument) REQUIRE d.document_id IS UNIQUE",
+    "CREATE CONSTRAINT constraint_chunk_id IF NOT EXISTS FOR (c:DocumentChunk) REQUIRE c.chunk_id IS UNIQUE",
+    "CREATE CONSTRAINT constraint_work_item_id IF NOT EXISTS FOR (w:WorkItem) REQUIRE w.work_item_id IS UNIQUE",
+    "CREATE CONSTRAINT constraint_disbursement_id IF NOT EXISTS FOR (d:Disbursement) REQUIRE d.disbursement_id IS UNIQUE",
+    "CREATE CONSTRAINT constraint_fee_earner_id IF NOT EXISTS FOR (f:FeeEarner) REQUIRE f.fee_earner_id IS UNIQUE",
+]
+
+def _run_schema_batch_tx(tx, statements):
+    tx.run(RUN_SCHEMA_BATCH, stmts=statements).consume()
+
+def run_schema_batch(session, statements):
+    """Execute schema statements via APOC in one request and one commit."""
+    session.execute_write(_run_schema_batch_tx, statements)
+
+def drop_existing_indexes(session):
     """Drop existing indexes and constraints."""
-    with driver.session() as session:
-        # Drop constraints first
-        session.run("""
-            CALL apoc.schema.assert({},{},true)
-        """)
-        console.print("[yellow]Dropped existing constraints[/yellow]")
-        
-        # Drop indexes
-        session.run("""
-            CALL apoc.schema.assert({},{},true)
-        """)
-        console.print("[yellow]Dropped existing indexes[/yellow]")
+    # A single assert with dropExisting=true removes both constraints and indexes
+    session.run("""
+        CALL apoc.schema.assert({},{},true)
+    """).consume()
+    console.print("[yellow]Dropped existing constraints and indexes[/yellow]")
 
-def create_indexes(driver):
+def create_indexes(session):
     """Create necessary indexes in Neo4j."""
-    with driver.session() as session:
-        # Create vector index for document chunks
-        try:
-            session.run("""
-            CREATE VECTOR INDEX document_chunks IF NOT EXISTS
-            FOR (dc:DocumentChunk)
-            ON (dc.embedding)
-            OPTIONS {
-                indexConfig: {
-                    `vector.dimensions`: 1536,
-                    `vector.similarity_function`: 'cosine'
-                }
-            }
-            """)
-            console.print("[green]Created vector index for document chunks[/green]")
-        except Exception as e:
-            console.print(f"[yellow]Note: Vector index creation failed (might already exist): {e}[/yellow]")
-
-        # Create indexes for case reference and IDs
-        try:
-            session.run("CREATE INDEX case_reference IF NOT EXISTS FOR (c:Case) ON (c.reference)")
-            session.run("CREATE INDEX case_id IF NOT EXISTS FOR (c:Case) ON (c.id)")
-            session.run("CREATE INDEX work_item_id IF NOT EXISTS FOR (w:WorkItem) ON (w.id)")
-            session.run("CREATE INDEX fee_earner_id IF NOT EXISTS FOR (f:FeeEarner) ON (f.id)")
-            session.run("CREATE INDEX document_chunk_id IF NOT EXISTS FOR (dc:DocumentChunk) ON (dc.id)")
-            console.print("[green]Created property indexes[/green]")
-        except Exception as e:
-            console.print(f"[yellow]Note: Property index creation failed (might already exist): {e}[/yellow]")
-
-def create_constraints(driver):
+    # Create vector index for document chunks
+    try:
+        session.run(f"""
+        CREATE VECTOR INDEX document_chunks IF NOT EXISTS
+        FOR (dc:DocumentChunk)
+        ON (dc.embedding)
+        OPTIONS {{
+            indexConfig: {{
+                `vector.dimensions`: {EMBEDDING_DIMENSIONS},
+                `vector.similarity_function`: 'cosine',
+                `vector.hnsw.m`: 16,
+                `vector.hnsw.ef_construction`: 200,
+                `vector.quantization.enabled`: true
+            }}
+        }}
+        """).consume()
+        console.print("[green]Created vector index for document chunks[/green]")
+    except Exception as e:
+        console.print(f"[yellow]Note: Vector index creation failed (might already exist): {e}[/yellow]")
+
+    wait_for_vector_index(session)
+
+    # Create indexes for case reference and IDs
+    try:
+        run_schema_batch(session, PROPERTY_INDEXES)
+        console.print("[green]Created property indexes[/green]")
+    except Exception as e:
+        console.print(f"[yellow]Note: Property index creation failed (might already exist): {e}[/yellow]")
+
+def wait_for_vector_index(session, timeout_seconds=VECTOR_INDEX_TIMEOUT_SECONDS):
+    """Block until the chunk vector index is ONLINE so searches never hit a populating index."""
+    try:
+        session.run(
+            "CALL db.awaitIndex('document_chunks', $timeout)", timeout=timeout_seconds
+        ).consume()
+        console.print("[green]Vector index is online[/green]")
+    except Exception as e:
+        console.print(f"[yellow]Note: Vector index not online after {timeout_seconds}s: {e}[/yellow]")
+
+def create_constraints(session):
     """Create necessary constraints in Neo4j."""
-    with driver.session() as session:
-        try:
-            # Drop existing indexes first to avoid conflicts
-            session.run("DROP INDEX case_id IF EXISTS")
-            session.run("DROP INDEX document_id IF EXISTS")
-            session.run("DROP INDEX chunk_id IF EXISTS")
-            session.run("DROP INDEX work_item_id IF EXISTS")
-            session.run("DROP INDEX disbursement_id IF EXISTS")
-            session.run("DROP INDEX fee_earner_id IF EXISTS")
-            
-            # Create constraints
-            session.run("CREATE CONSTRAINT constraint_case_id IF NOT EXISTS FOR (c:Case) REQUIRE c.id IS UNIQUE")
-            session.run("CREATE CONSTRAINT constraint_document_id IF NOT EXISTS FOR (d:SourceDocument) REQUIRE d.document_id IS UNIQUE")
-            session.run("CREATE CONSTRAINT constraint_chunk_id IF NOT EXISTS FOR (c:DocumentChunk) REQUIRE c.chunk_id IS UNIQUE")
-            session.run("CREATE CONSTRAINT constraint_work_item_id IF NOT EXISTS FOR (w:WorkItem) REQUIRE w.work_item_id IS UNIQUE")
-            session.run("CREATE CONSTRAINT constraint_disbursement_id IF NOT EXISTS FOR (d:Disbursement) REQUIRE d.disbursement_id IS UNIQUE")
-            session.run("CREATE CONSTRAINT constraint_fee_earner_id IF NOT EXISTS FOR (f:FeeEarner) REQUIRE f.fee_earner_id IS UNIQUE")
-            console.print("[green]Created constraints[/green]")
-        except Exception as e:
-            console.print(f"[yellow]Note: Constraint creation failed (might already exist): {e}[/yellow]")
-
-def create_default_records(driver):
+    try:
+        run_schema_batch(session, CONSTRAINTS)
+        console.print("[green]Created constraints[/green]")
+    except Exception as e:
+        console.print(f"[yellow]Note: Constraint creation failed (might already exist): {e}[/yellow]")
+
+DEFAULT_FIRM = {
+    "firm_id": "00000000-0000-0000-0000-000000000001",
+    "name": "Default Law Firm",
+    "sra_number": "123456",
+    "address": "123 Legal Street, London, UK",
+    "vat_number": "GB123456789",
+    "contact_email": "info@defaultlawfirm.com",
+}
+
+DEFAULT_CLIENT_PARTY = {
+    "party_id": "00000000-0000-0000-0000-000000000002",
+    "name": "Default Client",
+    "role": "Claimant",
+    "is_represented": True,
+    "solicitor_firm_name": "Default Law Firm",
+    "is_client_party": True,
+}
+
+# Parameterised so the plan is cached; MERGE on the ID keeps re-runs idempotent
+DEFAULT_RECORDS_QUERY = """
+MERGE (f:LawFirm {firm_id: $firm.firm_id})
+SET f += $firm
+MERGE (p:Party {party_id: $party.party_id})
+SET p += $party
+RETURN f.firm_id as firm_id, p.party_id as party_id
+"""
+
+def _create_default_records_tx(tx):
+    record = tx.run(DEFAULT_RECORDS_QUERY, firm=DEFAULT_FIRM, party=DEFAULT_CLIENT_PARTY).single()
+    return record["firm_id"], record["party_id"]
+
+def create_default_records(driver, database):
     """Create default records for law firm and client party."""
-    with driver.session() as session:
-        # Create default law firm
-        result = session.run("""
-            MERGE (f:LawFirm {
-                firm_id: '00000000-0000-0000-0000-000000000001',
-                name: 'Default Law Firm',
-                sra_number: '123456',
-                address: '123 Legal Street, London, UK',
-                vat_number: 'GB123456789',
-                contact_email: 'info@defaultlawfirm.com'
-            })
-            RETURN f.firm_id as firm_id
-        """)
-        firm_id = result.single()["firm_id"]
-        console.print("[green]Created default law firm[/green]")
-
-        # Create default client party
-        result = session.run("""
-            MERGE (p:Party {
-                party_id: '00000000-0000-0000-0000-000000000002',
-                name: 'Default Client',
-                role: 'Claimant',
-                is_represented: true,
-                solicitor_firm_name: 'Default Law Firm',
-                is_client_party: true
-            })
-            RETURN p.party_id as party_id
-        """)
-        party_id = result.single()["party_id"]
-        console.print("[green]Created default client party[/green]")
-
+    with driver.session(database=database) as session:
+        firm_id, party_id = session.execute_write(_create_default_records_tx)
+        console.print("[green]Created default law firm and client party[/green]")
         return firm_id, party_id
 
 def initialize_database():
@@ -133,6 +164,8 @@ def initialize_database():
         uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
         username = os.getenv("NEO4J_USERNAME", "neo4j")
         password = os.getenv("NEO4J_PASSWORD")
+        # Naming the database up front skips the routing lookup for the default one
+        database = os.getenv("NEO4J_DATABASE", "neo4j")
 
         if not password:
             console.print("[red]Error: NEO4J_PASSWORD environment variable not set[/red]")
@@ -146,17 +179,19 @@ def initialize_database():
             driver.verify_connectivity()
             console.print("[green]Connected to Neo4j[/green]")
             
-            # Drop existing indexes and constraints
-            drop_existing_indexes(driver)
-            
-            # Create indexes
-            create_indexes(driver)
-            
-            # Create constraints
-            create_constraints(driver)
+            # Schema changes share one session
+            with driver.session(database=database) as session:
+                # Drop existing indexes and constraints
+                drop_existing_indexes(session)
+                
+                # Create indexes
+                create_indexes(session)
+                
+                # Create constraints
+                create_constraints(session)
             
             # Create default records
-            firm_id, party_id = create_default_records(driver)
+            firm_id, party_id = create_default_records(driver, database)
             console.print(f"[green]Default records created with IDs:[/green]")
             console.print(f"[green]Firm ID: {firm_id}[/green]")
             console.print(f"[green]Party ID: {party_id}[/green]")
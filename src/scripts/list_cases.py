@@ -1,20 +1,32 @@
-import os
 import sys
 import logging
 import argparse
+from functools import lru_cache
+from pathlib import Path
 
-# Add the project root directory to the Python path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-sys.path.append(project_root)
+# Add the project root directory to the Python path, once per process
+if "src" not in sys.modules:
+    project_root = str(Path(__file__).parent.parent.parent)
+    if project_root not in sys.path:
+        sys.path.append(project_root)
 
 from src.graph.operations import Neo4jGraph
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CASE_DETAILS_TEMPLATE = (
+    "\nCase Details:\nID: {}\nName: {}\nType: {}\nStatus: {}\nCreated: {}\nUpdated: {}\n" + "-" * 50
+)
+
+@lru_cache(maxsize=1)
+def get_graph() -> Neo4jGraph:
+    """Return the Neo4jGraph shared by every lookup in this process."""
+    return Neo4jGraph()
+
 def list_all_cases():
     """List all cases in the database with their details."""
-    graph_ops = Neo4jGraph()
+    graph_ops = get_graph()
     
     # Query to get all cases with their basic information
     query = """
@@ -29,30 +41,23 @@ def list_all_cases():
     """
     
     try:
-        results = graph_ops.run_query(query)
-        results = results.data() if hasattr(results, 'data') else list(results)
-        logger.debug(f"Processed results: {results}")  # Log after processing
-        if not results:
-            logger.info("No cases found in the database.")
-            return
+        count = 0
+        # Records unpack positionally in RETURN order; one log call per case
+        for case_id, name, case_type, status, created, updated in graph_ops.stream_query(query):
+            count += 1
+            logger.info(CASE_DETAILS_TEMPLATE.format(case_id, name, case_type, status, created, updated))
             
-        logger.info(f"Found {len(results)} cases in the database:")
-        for case in results:
-            logger.info("\nCase Details:")
-            logger.info(f"ID: {case['case_id']}")
-            logger.info(f"Name: {case['case_name']}")
-            logger.info(f"Type: {case['case_type']}")
-            logger.info(f"Status: {case['status']}")
-            logger.info(f"Created: {case['created_at']}")
-            logger.info(f"Updated: {case['updated_at']}")
-            logger.info("-" * 50)
+        if count:
+            logger.info(f"Found {count} cases in the database.")
+        else:
+            logger.info("No cases found in the database.")
             
     except Exception as e:
         logger.error(f"Error listing cases: {str(e)}")
 
 def get_case_by_reference(reference_number: str):
     """Retrieve and print a case by its reference number."""
-    graph_ops = Neo4jGraph()
+    graph_ops = get_graph()
     query = """
     MATCH (c:Case {case_reference_number: $reference_number})
     RETURN c.case_id as case_id,
@@ -63,13 +68,10 @@ def get_case_by_reference(reference_number: str):
            c.updated_at as updated_at,
            c.case_reference_number as reference_number
     """
-    results = graph_ops.run_query(query, {"reference_number": reference_number})
-    results = results.data() if hasattr(results, 'data') else list(results)
-    logger.debug(f"Processed results: {results}")  # Log after processing
-    if not results:
+    case = next(graph_ops.stream_query(query, {"reference_number": reference_number}), None)
+    if case is None:
         logger.info(f"No case found with reference number: {reference_number}")
         return
-    case = results[0]
     logger.info("Case found:")
     logger.info(f"Reference: {case['reference_number']}")
     logger.info(f"ID: {case['case_id']}")
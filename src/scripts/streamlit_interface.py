@@ -3,18 +3,21 @@ import os
 import sys
 from pathlib import Path
 import streamlit as st
-from rich.console import Console
-import tempfile
+import threading
+from functools import lru_cache
+from collections import deque
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
-import uuid
+import re
 from datetime import datetime, UTC
-from typing import Dict, Any
-import base64
+from typing import Dict, Any, List, Optional, Tuple
 
-# Add src directory to Python path
-src_path = str(Path(__file__).parent.parent.parent)
-if src_path not in sys.path:
-    sys.path.append(src_path)
+# Add src directory to Python path; skipped on Streamlit reruns once src is imported
+if "src" not in sys.modules:
+    src_path = str(Path(__file__).parent.parent.parent)
+    if src_path not in sys.path:
+        sys.path.append(src_path)
 
 # Import using absolute paths from src
 from src.document_processing.processor import DocumentProcessor
@@ -23,21 +26,68 @@ from src.graph.operations import Neo4jGraph
 from src.models.domain import LegalCase
 from src.config import DEFAULT_FIRM_ID, DEFAULT_CLIENT_PARTY_ID
 
-console = Console()
+logger = logging.getLogger(__name__)
+
+# Created once per server process and shared across reruns and sessions
+@st.cache_resource(show_spinner=False)
+def get_graph() -> Neo4jGraph:
+    return Neo4jGraph()
+
+@st.cache_resource(show_spinner=False)
+def get_processor() -> DocumentProcessor:
+    return DocumentProcessor(get_graph())
+
+@st.cache_resource(show_spinner=False)
+def get_bill_generator() -> BillGenerator:
+    return BillGenerator(get_graph())
+
+def _warm_components(processor: DocumentProcessor, bill_generator: BillGenerator) -> None:
+    try:
+        processor.warm()
+        bill_generator.warm()
+    except Exception as e:
+        logger.warning(f"Component warm-up failed: {e}")
+
+@st.cache_resource(show_spinner=False)
+def start_warmup() -> threading.Thread:
+    """Warm the shared components in the background, once per server process."""
+    thread = threading.Thread(
+        target=_warm_components,
+        args=(get_processor(), get_bill_generator()),
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+# Per-file results use Streamlit's themed alert boxes rather than injected HTML
+STATUS_BOX_CALLS = {"success": st.success, "warning": st.warning, "error": st.error}
 
 # Configure logging to capture in Streamlit
 class StreamlitHandler(logging.Handler):
+    # Repaint at most every FLUSH_INTERVAL seconds or FLUSH_RECORDS records
+    FLUSH_INTERVAL = 0.2
+    FLUSH_RECORDS = 25
+
     def __init__(self, container):
         super().__init__()
         self.container = container
-        self.logs = []
+        # Bounded, so old records drop off without re-slicing the list
+        self.logs = deque(maxlen=1000)
+        self._pending = []
+        self._last_flush = time.monotonic()
         
     def emit(self, record):
-        log_entry = self.format(record)
-        self.logs.append(log_entry)
-        # Keep only last 1000 logs
-        if len(self.logs) > 1000:
-            self.logs = self.logs[-1000:]
+        self._pending.append(self.format(record))
+        if (len(self._pending) >= self.FLUSH_RECORDS
+                or time.monotonic() - self._last_flush > self.FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self.logs.extend(self._pending)
+        self._pending = []
+        self._last_flush = time.monotonic()
         # Update the container
         self.container.text_area("Processing Logs", "\n".join(self.logs), height=300)
 
@@ -53,45 +103,81 @@ def init_session_state():
         st.session_state.is_processing = False
     if 'overall_progress' not in st.session_state:
         st.session_state.overall_progress = 0
+    if 'current_case' not in st.session_state:
+        st.session_state.current_case = None
 
-def process_document(processor, file, progress_bar, status_text, index, total_files):
+def process_document(processor, file, case_reference: Optional[str] = None) -> str:
     """Process a single document and return its status."""
     try:
-        def update_status(message):
-            status_text.text(f"Processing {file.name}... {message}")
-        
-        # Save uploaded file temporarily
-        file_path = Path(file.name)
-        with open(file_path, "wb") as f:
-            f.write(file.getbuffer())
-        
-        # Process document with status updates
-        processor.process_document(str(file_path), status_callback=update_status)
-        status = "success"
-        
+        # The upload is parsed from memory; its name is what gets recorded on the document
+        processor.process_document(
+            Path(file.name).name, case_reference=case_reference, data=file.getvalue()
+        )
+        return "success"
     except ValueError as e:
-        status = f"warning: {str(e)}"
+        return f"warning: {str(e)}"
     except Exception as e:
-        status = f"error: {str(e)}"
-    finally:
-        # Clean up uploaded file
-        if file_path.exists():
-            os.remove(file_path)
-        
-        # Update progress
-        progress = (index + 1) / total_files
-        st.session_state.overall_progress = progress
-        progress_bar.progress(progress)
-        
-    return status
+        return f"error: {str(e)}"
+
+def process_documents(files, case_reference: Optional[str] = None) -> Dict[str, str]:
+    """Process uploaded documents concurrently and return each file's status.
+
+    Extraction is dominated by waiting on Ollama and Neo4j, so files run on a
+    thread pool. DocumentProcessor tracks the current case on the instance, so
+    each worker thread gets its own. Streamlit elements may only be touched
+    from the script thread, which reports each file in one st.status
+    container as it completes.
+    """
+    graph_ops = get_graph()
+    local = threading.local()
 
+    def run(file):
+        if not hasattr(local, "processor"):
+            local.processor = DocumentProcessor(graph_ops)
+        return process_document(local.processor, file, case_reference)
+
+    statuses = {}
+    with st.status(f"Processing {len(files)} documents...", expanded=True) as status:
+        progress_bar = st.progress(0.0)
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+            futures = {executor.submit(run, file): file for file in files}
+            for completed, future in enumerate(as_completed(futures), 1):
+                file = futures[future]
+                statuses[file.name] = future.result()
+                kind, _, message = statuses[file.name].partition(": ")
+                STATUS_BOX_CALLS.get(kind, st.info)(f"**{file.name}**: {message or kind}")
+                progress = completed / len(files)
+                st.session_state.overall_progress = progress
+                progress_bar.progress(progress)
+        failed = [name for name, result in statuses.items() if result != "success"]
+        status.update(
+            label=f"Processed {len(files)} documents" + (f" ({len(failed)} with problems)" if failed else ""),
+            state="error" if failed else "complete"
+        )
+    return statuses
+
+# Canonical hyphenated form, the only one the UUID input asks for
+_UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
+@lru_cache(maxsize=256)
 def is_valid_uuid(uuid_str: str) -> bool:
     """Check if a string is a valid UUID."""
-    try:
-        uuid.UUID(uuid_str)
-        return True
-    except ValueError:
-        return False
+    return bool(_UUID_RE.match(uuid_str))
+
+# Case lookups are cached per input so widget reruns don't re-query Neo4j
+@st.cache_data(ttl=300, show_spinner=False)
+def load_case_by_id(case_id: str) -> Optional[Dict[str, Any]]:
+    case = get_graph().get_case(case_id)
+    return case.model_dump() if case else None
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_case_by_reference(reference: str) -> Optional[Dict[str, Any]]:
+    case = get_graph().find_case_by_reference(reference)
+    return case.model_dump() if case else None
+
+@st.cache_data(ttl=60)
+def load_case_summaries() -> List[Tuple[str, str, str]]:
+    return [tuple(summary) for summary in get_graph().get_case_summaries()]
 
 def retrieve_case_details(case_id: str) -> Dict[str, Any]:
     """Retrieve details of an existing case from the database."""
@@ -99,8 +185,7 @@ def retrieve_case_details(case_id: str) -> Dict[str, Any]:
         st.error("Invalid Case ID format. Please enter a valid UUID.")
         return None
         
-    graph_ops = Neo4jGraph()
-    case = graph_ops.get_case(case_id)
+    case = load_case_by_id(case_id)
     if not case:
         st.error(f"Case not found with ID: {case_id}")
         return None
@@ -145,56 +230,21 @@ def display_case_details(case_details: Dict[str, Any]):
 
 def retrieve_case_by_reference(reference: str) -> Dict[str, Any]:
     """Retrieve details of an existing case from the database using reference number."""
-    graph_ops = Neo4jGraph()
-    case = graph_ops.find_case_by_reference(reference)
+    case = load_case_by_reference(reference)
     if not case:
         st.error(f"Case not found with reference: {reference}")
         return None
-    return case.model_dump()
+    return case
 
 def main():
     """Main function to run the Streamlit interface."""
-    # Initialize session state
-    if 'uploaded_files' not in st.session_state:
-        st.session_state.uploaded_files = []
-    if 'processing_status' not in st.session_state:
-        st.session_state.processing_status = {}
-    if 'failed_files' not in st.session_state:
-        st.session_state.failed_files = []
-    if 'current_case' not in st.session_state:
-        st.session_state.current_case = None
+    init_session_state()
 
     # Initialize components
-    graph_ops = Neo4jGraph()
-    processor = DocumentProcessor(graph_ops)
-    bill_generator = BillGenerator(graph_ops)
-
-    # Custom CSS
-    st.markdown("""
-        <style>
-        .success-box {
-            background-color: #d4edda;
-            color: #155724;
-            padding: 10px;
-            border-radius: 5px;
-            margin: 10px 0;
-        }
-        .error-box {
-            background-color: #f8d7da;
-            color: #721c24;
-            padding: 10px;
-            border-radius: 5px;
-            margin: 10px 0;
-        }
-        .info-box {
-            background-color: #cce5ff;
-            color: #004085;
-            padding: 10px;
-            border-radius: 5px;
-            margin: 10px 0;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    graph_ops = get_graph()
+    processor = get_processor()
+    bill_generator = get_bill_generator()
+    start_warmup()
 
     st.title("UK Legal Costing RAG System")
 
@@ -211,41 +261,69 @@ def main():
         for file in st.session_state.uploaded_files:
             st.write(f"- {file.name}")
 
+        current_case = st.session_state.get('current_case')
+        if st.button("Process Documents", disabled=not current_case,
+                     help="Retrieve the case these documents belong to first"):
+            statuses = process_documents(
+                st.session_state.uploaded_files, current_case.get("case_reference_number")
+            )
+            st.session_state.processing_status = statuses
+            st.session_state.failed_files = [name for name, status in statuses.items() if status != "success"]
+            # Processing adds work items and disbursements to the case
+            load_case_by_id.clear()
+            load_case_by_reference.clear()
+
     # Retrieve existing case details
     st.header("Retrieve Existing Case")
-    st.markdown("""
-        <div class="info-box">
-            Enter either a case reference number or UUID to retrieve case details.
-        </div>
-    """, unsafe_allow_html=True)
+    st.info("Enter either a case reference number or UUID to retrieve case details.")
     
+    if st.button("Refresh cases"):
+        load_case_summaries.clear()
+        load_case_by_id.clear()
+        load_case_by_reference.clear()
+
+    summaries = load_case_summaries()
+    selected = st.selectbox(
+        "Select a recent case",
+        options=[None] + summaries,
+        format_func=lambda summary: "—" if summary is None else f"{summary[1]} – {summary[2]}"
+    )
+    if selected:
+        case_details = retrieve_case_details(selected[0])
+        if case_details:
+            display_case_details(case_details)
+            st.session_state.current_case = case_details
+
     # Create two columns for input methods
     col1, col2 = st.columns(2)
     
+    # Inputs inside a form don't rerun the script per keystroke; lookups happen on submit
     with col1:
-        case_reference = st.text_input("Enter Case Reference Number", 
-                                     help="Enter the reference number of the case you want to retrieve")
-        if case_reference:
-            case_details = retrieve_case_by_reference(case_reference)
-            if case_details:
-                display_case_details(case_details)
-                st.session_state.current_case = case_details
+        with st.form("lookup_ref"):
+            case_reference = st.text_input("Enter Case Reference Number", 
+                                         help="Enter the reference number of the case you want to retrieve")
+            st.form_submit_button("Look up")
     
     with col2:
-        case_id = st.text_input("Enter Case ID (UUID)", 
-                               help="Enter the UUID of the case you want to retrieve")
-        if case_id:
-            if is_valid_uuid(case_id):
-                case_details = retrieve_case_details(case_id)
-                if case_details:
-                    display_case_details(case_details)
-                    st.session_state.current_case = case_details
-            else:
-                st.error("Please enter a valid UUID in the format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx")
+        with st.form("lookup_id"):
+            case_id = st.text_input("Enter Case ID (UUID)", 
+                                   help="Enter the UUID of the case you want to retrieve")
+            st.form_submit_button("Look up")
+
+    # One lookup per rerun; a valid UUID takes priority over a reference
+    case_details = None
+    if case_id and is_valid_uuid(case_id):
+        case_details = retrieve_case_details(case_id)
+    elif case_id:
+        st.error("Please enter a valid UUID in the format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx")
+    elif case_reference:
+        case_details = retrieve_case_by_reference(case_reference)
+    if case_details:
+        display_case_details(case_details)
+        st.session_state.current_case = case_details
 
     # Generate bill button and download button side by side
     bill_generated = False
-    bill_html = None
     bill_path = None
     if st.session_state.get('current_case'):
         colA, colB = st.columns([1,1])
@@ -264,29 +342,25 @@ def main():
                 bill = bill_generator.generate_bill(st.session_state.current_case["case_id"])
                 st.success(f"Bill generated successfully. Total amount: £{bill.total_amount:.2f}, Recoverable: £{bill.recoverable_amount:.2f}")
                 bill_path = bill_generator.save_bill(bill)
-                with open(bill_path, 'r', encoding='utf-8') as f:
-                    bill_html = f.read()
                 bill_generated = True
             except Exception as e:
                 st.error(f"Error generating bill: {str(e)}")
 
     # Show download button if bill was generated
-    if bill_generated and bill_html and bill_path:
-        download_placeholder.download_button(
-            label="Download Bill of Costs",
-            data=bill_html,
-            file_name=os.path.basename(bill_path),
-            mime="text/html"
-        )
+    # The bill is read from disk for each use, so no copy of it outlives the rerun
+    if bill_generated and bill_path:
+        with open(bill_path, 'rb') as bill_file:
+            download_placeholder.download_button(
+                label="Download Bill of Costs",
+                data=bill_file,
+                file_name=os.path.basename(bill_path),
+                mime="text/html"
+            )
         # Full-width preview below
         st.markdown("---")
         st.markdown("### Bill Preview")
-        st.components.v1.iframe(
-            f"data:text/html;base64,{base64.b64encode(bill_html.encode()).decode()}",
-            height=900,
-            width=None,
-            scrolling=True
-        )
+        # Rendered directly rather than as a base64 data URL, which is a third larger
+        st.components.v1.html(Path(bill_path).read_text(encoding='utf-8'), height=900, scrolling=True)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,22 +1,34 @@
-from neo4j import GraphDatabase
+import sys
+from neo4j import GraphDatabase, Session
+from neo4j.exceptions import Neo4jError
 import os
 from dotenv import load_dotenv
 from pathlib import Path
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
 import difflib
+import io
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src directory to Python path
+src_path = str(Path(__file__).parent.parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.document_processing.loaders import extract_text
 
 load_dotenv()
 
+# Horizontal whitespace runs; newlines are kept so line structure survives
+_WS_RE = re.compile(r'[ \t\r\f\v]+')
+# A line break plus the spaces and blank lines around it
+_BLANK_LINE_RE = re.compile(r'\s*\n\s*')
+
+_UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
 def normalize_content(content: str) -> str:
     """Normalize content by removing extra whitespace and normalizing line endings."""
-    # Replace multiple spaces with a single space
-    content = re.sub(r'\s+', ' ', content)
-    # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in content.split('\n')]
-    # Remove empty lines
-    lines = [line for line in lines if line]
-    return '\n'.join(lines)
+    content = _WS_RE.sub(' ', content)
+    return _BLANK_LINE_RE.sub('\n', content).strip()
 
 def get_original_content(file_path: str) -> str:
     """Get the original content from the file."""
@@ -24,43 +36,87 @@ def get_original_content(file_path: str) -> str:
     if not file_path.exists():
         raise ValueError(f"File not found: {file_path}")
         
-    file_extension = file_path.suffix.lower()
-    
-    if file_extension == '.pdf':
-        loader = PyPDFLoader(str(file_path))
-    elif file_extension == '.txt':
-        loader = TextLoader(str(file_path))
-    else:
-        raise ValueError(f"Unsupported file type: {file_extension}")
-    
-    documents = loader.load()
-    content = "\n".join(doc.page_content for doc in documents)
-    return normalize_content(content)
-
-def get_ingested_content(driver: GraphDatabase.driver, case_id: str, file_name: str) -> str:
-    """Get the content from Neo4j."""
-    with driver.session() as session:
-        # First, try to find the case by title if a UUID is not provided
-        if not case_id.startswith(('0', '1', '2', '3', '4', '5', '6', '7', '8', '9', 'a', 'b', 'c', 'd', 'e', 'f')):
-            result = session.run("""
-                MATCH (c:Case {title: $case_id})
-                RETURN c.id as case_id
-            """, case_id=case_id)
-            record = result.single()
-            if record:
-                case_id = record["case_id"]
-            else:
-                raise ValueError(f"Case with title '{case_id}' not found")
+    # Same extractor as ingestion, so only real ingestion gaps show up as differences
+    return normalize_content(extract_text(str(file_path)))
 
+# Joins the chunks server-side so a single record comes back over Bolt
+JOINED_CONTENT_QUERY = """
+MATCH (c:Case {id: $case_id})-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
+WHERE dc.source_file = $file_name
+WITH dc ORDER BY dc.page, dc.chunk_index
+RETURN apoc.text.join(collect(dc.content), '\\n') AS content
+"""
+
+CHUNK_CONTENT_QUERY = """
+MATCH (c:Case {id: $case_id})-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
+WHERE dc.source_file = $file_name
+RETURN dc.content as content
+ORDER BY dc.page, dc.chunk_index
+"""
+
+def get_ingested_content(session: Session, case_id: str, file_name: str) -> str:
+    """Get the content from Neo4j using the caller's session."""
+    # First, try to find the case by title if a UUID is not provided
+    if not _UUID_RE.match(case_id):
         result = session.run("""
-            MATCH (c:Case {id: $case_id})-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
-            WHERE dc.source_file = $file_name
-            RETURN dc.content as content
-            ORDER BY dc.page, dc.chunk_index
-        """, case_id=case_id, file_name=file_name)
-        
-        content = "\n".join(record["content"] for record in result)
-        return normalize_content(content)
+            MATCH (c:Case {title: $case_id})
+            RETURN c.id as case_id
+        """, case_id=case_id)
+        record = result.single()
+        if record:
+            case_id = record["case_id"]
+        else:
+            raise ValueError(f"Case with title '{case_id}' not found")
+
+    try:
+        record = session.run(
+            JOINED_CONTENT_QUERY, case_id=case_id, file_name=file_name
+        ).single()
+        return normalize_content(record["content"])
+    except Neo4jError:
+        # APOC is not installed; join the chunks client-side instead
+        pass
+
+    result = session.run(CHUNK_CONTENT_QUERY, case_id=case_id, file_name=file_name)
+    
+    # Append straight from the cursor rather than building a list of every chunk
+    buf = io.StringIO()
+    first = True
+    for record in result:
+        if not first:
+            buf.write("\n")
+        buf.write(record["content"])
+        first = False
+    return normalize_content(buf.getvalue())
+
+def fetch_ingested_content(driver, case_id: str, file_name: str) -> str:
+    """Get the content from Neo4j in a session owned by the calling thread."""
+    # The title lookup and chunk read share one session, and larger fetches
+    # pull the chunk stream in fewer Bolt round trips
+    with driver.session(fetch_size=10_000) as session:
+        return get_ingested_content(session, case_id, file_name)
+
+# Past this relative length gap a line diff says nothing a summary doesn't
+LENGTH_MISMATCH_RATIO = 0.5
+DIFF_CONTEXT_LINES = 3
+
+def print_first_difference(original_lines, ingested_lines, context=DIFF_CONTEXT_LINES):
+    """Print the first differing region of two line lists with surrounding context."""
+    matcher = difflib.SequenceMatcher(None, original_lines, ingested_lines)
+    opcode = next((op for op in matcher.get_opcodes() if op[0] != 'equal'), None)
+    if opcode is None:
+        return
+    tag, i1, i2, j1, j2 = opcode
+    start = max(i1 - context, 0)
+    print(f"@@ first {tag} at original line {i1 + 1}, ingested line {j1 + 1} @@")
+    for line in original_lines[start:i1]:
+        print(f" {line}")
+    for line in original_lines[i1:i2]:
+        print(f"-{line}")
+    for line in ingested_lines[j1:j2]:
+        print(f"+{line}")
+    for line in original_lines[i2:i2 + context]:
+        print(f" {line}")
 
 def verify_document_content(file_path: str, case_id: str):
     """Verify that all content from the file has been ingested correctly."""
@@ -71,12 +127,13 @@ def verify_document_content(file_path: str, case_id: str):
     )
 
     try:
-        # Get original content
-        original_content = get_original_content(file_path)
-        
-        # Get ingested content
+        # Parse the file while the chunks stream in from Neo4j
         file_name = Path(file_path).name
-        ingested_content = get_ingested_content(driver, case_id, file_name)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            original_future = executor.submit(get_original_content, file_path)
+            ingested_future = executor.submit(fetch_ingested_content, driver, case_id, file_name)
+            original_content = original_future.result()
+            ingested_content = ingested_future.result()
         
         # Compare contents
         print(f"\nVerifying content for file: {file_name}")
@@ -86,17 +143,17 @@ def verify_document_content(file_path: str, case_id: str):
         
         if original_content == ingested_content:
             print("\n✅ Content verification successful! All content has been ingested correctly.")
-        else:
-            print("\n❌ Content verification failed! Differences found:")
-            # Show differences
-            diff = difflib.unified_diff(
-                original_content.splitlines(),
-                ingested_content.splitlines(),
-                lineterm='',
-                n=3
-            )
-            print('\n'.join(diff))
-            
+            return
+
+        print("\n❌ Content verification failed! Differences found:")
+        longer = max(len(original_content), len(ingested_content))
+        if abs(len(original_content) - len(ingested_content)) > LENGTH_MISMATCH_RATIO * longer:
+            print(f"Lengths differ by more than {LENGTH_MISMATCH_RATIO:.0%}; skipping the line diff.")
+            return
+
+        # Only the first mismatch is shown, so the full unified diff is never formatted
+        print_first_difference(original_content.splitlines(), ingested_content.splitlines())
+
     finally:
         driver.close()
 
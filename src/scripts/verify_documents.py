@@ -1,60 +1,73 @@
-from neo4j import GraphDatabase
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-def verify_documents():
-    # Connect to Neo4j
-    driver = GraphDatabase.driver(
-        os.getenv("NEO4J_URI", "bolt://localhost:7687"),
-        auth=(os.getenv("NEO4J_USERNAME", "neo4j"), os.getenv("NEO4J_PASSWORD", "password"))
-    )
-
-    try:
-        with driver.session() as session:
-            # Get all cases and their document chunks
-            result = session.run("""
-                MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
-                RETURN 
-                    c.title as case_title,
-                    c.reference as case_reference,
-                    count(dc) as chunk_count,
-                    collect(DISTINCT dc.source_file) as files
-                ORDER BY c.title
-            """)
-            
-            print("\nCases and their document chunks:")
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+src_path = str(Path(__file__).parent.parent.parent)
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from src.graph.driver import get_driver
+
+# Per-case summaries then a sample of chunks, in one round-trip; `kind` says which is which
+VERIFY_DOCUMENTS_QUERY = """
+MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
+WITH c, count(dc) as chunk_count, collect(DISTINCT dc.source_file) as files
+ORDER BY c.title
+RETURN 
+    'case' as kind,
+    c.title as case_title,
+    c.reference as case_reference,
+    chunk_count,
+    files,
+    null as file,
+    null as page,
+    null as content_preview
+UNION ALL
+MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
+WITH c, dc
+LIMIT $sample_limit
+RETURN 
+    'sample' as kind,
+    c.title as case_title,
+    null as case_reference,
+    null as chunk_count,
+    null as files,
+    dc.source_file as file,
+    dc.page as page,
+    substring(dc.content, 0, 100) as content_preview
+"""
+
+def _fetch_documents_report(tx, sample_limit):
+    # Collected inside the transaction so a retried attempt never prints twice
+    return [record.data() for record in tx.run(VERIFY_DOCUMENTS_QUERY, sample_limit=sample_limit)]
+
+def verify_documents(sample_limit: int = 5):
+    # The shared driver is created on first use and closed at exit
+    with get_driver().session() as session:
+        records = session.execute_read(_fetch_documents_report, sample_limit)
+
+    print("\nCases and their document chunks:")
+    print("-" * 80)
+    in_samples = False
+    for record in records:
+        if record["kind"] == "case":
+            print(f"Case Title: {record['case_title']}")
+            print(f"Case Reference: {record['case_reference']}")
+            print(f"Number of chunks: {record['chunk_count']}")
+            print(f"Files: {', '.join(record['files'])}")
             print("-" * 80)
-            for record in result:
-                print(f"Case Title: {record['case_title']}")
-                print(f"Case Reference: {record['case_reference']}")
-                print(f"Number of chunks: {record['chunk_count']}")
-                print(f"Files: {', '.join(record['files'])}")
-                print("-" * 80)
+            continue
 
+        if not in_samples:
             # Get a sample of document chunks
             print("\nSample of document chunks:")
             print("-" * 80)
-            result = session.run("""
-                MATCH (c:Case)-[:HAS_DOCUMENT_CHUNK]->(dc:DocumentChunk)
-                RETURN 
-                    c.title as case_title,
-                    dc.source_file as file,
-                    dc.page as page,
-                    substring(dc.content, 0, 100) as content_preview
-                LIMIT 5
-            """)
-            
-            for record in result:
-                print(f"Case: {record['case_title']}")
-                print(f"File: {record['file']}")
-                print(f"Page: {record['page']}")
-                print(f"Content preview: {record['content_preview']}...")
-                print("-" * 80)
-
-    finally:
-        driver.close()
+            in_samples = True
+        print(f"Case: {record['case_title']}")
+        print(f"File: {record['file']}")
+        print(f"Page: {record['page']}")
+        print(f"Content preview: {record['content_preview']}...")
+        print("-" * 80)
 
 if __name__ == "__main__":
-    verify_documents() 
\ No newline at end of file
+    verify_documents()
@@ -13,41 +13,60 @@ if src_path not in sys.path:
 os.environ["NEO4J_URI"] = "bolt://localhost:7687"
 os.environ["NEO4J_USER"] = "neo4j"
 os.environ["NEO4J_PASSWORD"] = "password"
-os.environ["NEO4J_DATABASE"] = "neo4j"  # Use the default database
+# Under pytest-xdist each worker gets its own database, so cleanups never contend;
+# a serial run uses the default database
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+TEST_DATABASE = f"test-{_XDIST_WORKER}" if _XDIST_WORKER else "neo4j"
+os.environ["NEO4J_DATABASE"] = TEST_DATABASE
+# Pool sized for a few parallel workers; fail fast rather than queue on a busy pool
+os.environ.setdefault("NEO4J_POOL_SIZE", "32")
+os.environ.setdefault("NEO4J_ACQ_TIMEOUT", "30")
+# Recycle connections well inside CI idle timeouts so a pause never hits a dead socket
+os.environ.setdefault("NEO4J_MAX_CONNECTION_LIFETIME", "300")
 
-@pytest.fixture(scope="session", autouse=True)
-def setup_test_environment():
-    """Set up test environment before running tests."""
-    # Connect to Neo4j
+from src.graph.driver import pool_settings
+
+# Deletes in batches so a seeded database never needs one huge transaction;
+# IN TRANSACTIONS only runs in auto-commit sessions, hence session.run
+CLEAR_DATABASE_QUERY = "MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+
+@pytest.fixture(scope="session")
+def neo4j_driver():
+    """One driver for the whole run, so its connection pool stays warm between tests."""
     driver = GraphDatabase.driver(
         os.environ["NEO4J_URI"],
-        auth=(os.environ["NEO4J_USER"], os.environ["NEO4J_PASSWORD"])
+        auth=(os.environ["NEO4J_USER"], os.environ["NEO4J_PASSWORD"]),
+        **pool_settings()
     )
-    
+    if _XDIST_WORKER:
+        # Per-worker databases need Neo4j Enterprise
+        with driver.session(database="system") as session:
+            session.run("CREATE DATABASE $name IF NOT EXISTS WAIT", name=TEST_DATABASE).consume()
+    yield driver
+    driver.close()
+
+@pytest.fixture(scope="session")
+def setup_test_environment(neo4j_driver):
+    """Set up the test database before the first test that needs it, and wipe it after the run."""
     # Clean up any existing test data
-    with driver.session() as session:
-        session.run("MATCH (n) DETACH DELETE n")
+    with neo4j_driver.session(database=TEST_DATABASE) as session:
+        session.run(CLEAR_DATABASE_QUERY).consume()
     
-    driver.close()
     yield
     
     # Clean up after all tests
-    driver = GraphDatabase.driver(
-        os.environ["NEO4J_URI"],
-        auth=(os.environ["NEO4J_USER"], os.environ["NEO4J_PASSWORD"])
-    )
-    with driver.session() as session:
-        session.run("MATCH (n) DETACH DELETE n")
-    driver.close()
+    with neo4j_driver.session(database=TEST_DATABASE) as session:
+        session.run(CLEAR_DATABASE_QUERY).consume()
+
+@pytest.fixture
+def cleanup_database(neo4j_driver, setup_test_environment):
+    """Clean up the database before a test; request it by name in tests that write to Neo4j."""
+    with neo4j_driver.session(database=TEST_DATABASE) as session:
+        session.run(CLEAR_DATABASE_QUERY).consume()
+    yield
 
 @pytest.fixture(autouse=True)
-def cleanup_database():
-    """Clean up the database before each test."""
-    driver = GraphDatabase.driver(
-        os.environ["NEO4J_URI"],
-        auth=(os.environ["NEO4J_USER"], os.environ["NEO4J_PASSWORD"])
-    )
-    with driver.session() as session:
-        session.run("MATCH (n) DETACH DELETE n")
-    driver.close()
-    yield 
\ No newline at end of file
+def neo4j_marker(request):
+    """Give tests marked neo4j a clean database; unmarked tests never connect."""
+    if request.node.get_closest_marker("neo4j"):
+        request.getfixturevalue("cleanup_database")
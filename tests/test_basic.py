@@ -1,68 +1,87 @@
 import pytest
 from datetime import datetime
 from decimal import Decimal
+import itertools
 import uuid
 
-from src.models.domain import LegalCase, WorkItem, FeeEarner, DocumentType
+from src.config import DEFAULT_FIRM_ID, DEFAULT_CLIENT_PARTY_ID
+from src.models.domain import LegalCase, WorkItem, FeeEarner, FeeEarnerGrade, WorkActivityType
 from src.graph.operations import Neo4jGraph
-from src.llm.operations import LLMOperations
-from src.document.processor import DocumentProcessor
+from src.llm.operations import LLMOperations, get_llm_operations, CHUNK_SIZE_TOKENS, CHUNK_OVERLAP_TOKENS
+from src.document_processing.processor import DocumentProcessor
 from src.generation.generator import DocumentGenerator
 
-@pytest.fixture
-def test_case():
-    """Create a test case with some work items and fee earners."""
-    case_id = str(uuid.uuid4())
-    fee_earner = FeeEarner(
-        id=str(uuid.uuid4()),
+_RATE = Decimal("350.00")
+_NOW = datetime.utcnow()
+# Test identities only need to be unique, not random; start clear of the
+# small fixed ids in src.config
+_ids = itertools.count(1000)
+
+@pytest.fixture(scope="session")
+def fee_earner():
+    """Create a fee earner at the default firm."""
+    return FeeEarner(
+        fe_id=uuid.UUID(int=next(_ids)),
+        firm_id=DEFAULT_FIRM_ID,
         name="John Smith",
-        grade="Partner",
-        hourly_rate=Decimal("350.00")
+        role_at_firm="Partner",
+        qualification_level=FeeEarnerGrade.GRADE_A,
+        default_hourly_rate_gbp=_RATE
     )
-    
+
+@pytest.fixture(scope="session")
+def test_case(fee_earner):
+    """Create a test case with a work item by one fee earner, shared read-only across tests."""
+    case_id = uuid.UUID(int=next(_ids))
     work_item = WorkItem(
-        id=str(uuid.uuid4()),
-        date=datetime.now(),
+        work_item_id=uuid.UUID(int=next(_ids)),
+        case_id=case_id,
+        fee_earner_id=fee_earner.fe_id,
+        date_of_work=_NOW.date(),
+        activity_type=WorkActivityType.ATTENDANCE_CLIENT,
         description="Initial client meeting",
         time_spent_units=10,
-        fee_earner_id=fee_earner.id,
-        amount=Decimal("350.00"),
-        category="Pre-action"
+        time_spent_decimal_hours=1.0,
+        applicable_hourly_rate_gbp=_RATE,
+        claimed_amount_gbp=_RATE
     )
-    
+
     return LegalCase(
-        id=case_id,
-        reference="TEST001",
-        title="Test Case",
-        court="High Court",
-        description="A test case for unit testing",
+        case_id=case_id,
+        case_reference_number="TEST001",
+        case_name="Test Case",
+        our_firm_id=DEFAULT_FIRM_ID,
+        our_client_party_id=DEFAULT_CLIENT_PARTY_ID,
+        date_opened=_NOW.date(),
+        narrative_summary="A test case for unit testing",
         work_items=[work_item],
-        fee_earners=[fee_earner],
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        fee_earners_involved_ids=[fee_earner.fe_id]
     )
 
-def test_case_model(test_case):
+def test_case_model(test_case, fee_earner):
     """Test that the Case model works correctly."""
-    assert test_case.reference == "TEST001"
+    assert test_case.case_reference_number == "TEST001"
     assert len(test_case.work_items) == 1
-    assert len(test_case.fee_earners) == 1
-    assert test_case.work_items[0].amount == Decimal("350.00")
-    assert test_case.fee_earners[0].name == "John Smith"
+    assert test_case.fee_earners_involved_ids == [fee_earner.fe_id]
+    assert test_case.work_items[0].claimed_amount_gbp == 350.0
+    assert test_case.work_items[0].fee_earner_id == fee_earner.fe_id
+    assert fee_earner.name == "John Smith"
 
 def test_llm_operations():
     """Test that LLM operations can be initialized."""
     llm_ops = LLMOperations()
-    assert llm_ops.model == "mistral"
-    assert llm_ops.embedding_model == "nomic-embed-text"
+    assert llm_ops.llm.model == "mistral"
+    assert llm_ops.embeddings.model == "nomic-embed-text"
 
 def test_document_processor():
     """Test that DocumentProcessor can be initialized."""
-    processor = DocumentProcessor()
-    assert processor.text_splitter.chunk_size == 1000
-    assert processor.text_splitter.chunk_overlap == 150
+    # Creating the driver doesn't connect, so no database is needed
+    processor = DocumentProcessor(Neo4jGraph())
+    assert processor.llm_ops is get_llm_operations()
+    assert CHUNK_SIZE_TOKENS == 600
+    assert CHUNK_OVERLAP_TOKENS == 100
 
 def test_document_generator():
     """Test that DocumentGenerator can be initialized."""
     generator = DocumentGenerator()
-    assert generator is not None 
\ No newline at end of file
+    assert generator is not None
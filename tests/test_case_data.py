@@ -0,0 +1,70 @@
+from datetime import date
+import uuid
+
+import orjson
+
+from src.config import DEFAULT_FIRM_ID, DEFAULT_CLIENT_PARTY_ID
+from src.models.domain import LegalCase, WorkItem, Disbursement, WorkActivityType, DisbursementType
+from src.llm.operations import LLMOperations, _PROMPTS
+
+def _legal_case(**overrides):
+    case_id = uuid.UUID(int=1001)
+    fields = dict(
+        case_id=case_id,
+        case_reference_number="TEST001",
+        case_name="Smith v Jones",
+        our_firm_id=DEFAULT_FIRM_ID,
+        our_client_party_id=DEFAULT_CLIENT_PARTY_ID,
+        work_items=[WorkItem(
+            case_id=case_id,
+            fee_earner_id=uuid.UUID(int=1002),
+            date_of_work=date(2024, 1, 2),
+            activity_type=WorkActivityType.ATTENDANCE_CLIENT,
+            description="Initial client meeting",
+            time_spent_units=10,
+            claimed_amount_gbp=350.0
+        )],
+        disbursements=[Disbursement(
+            case_id=case_id,
+            date_incurred=date(2024, 1, 3),
+            disbursement_type=DisbursementType.COURT_FEE,
+            description="Issue fee",
+            amount_net_gbp=455.0
+        )]
+    )
+    fields.update(overrides)
+    return LegalCase(**fields)
+
+def test_build_case_data_from_legal_case():
+    """Prompt data is read from the LegalCase fields, with items serialized to JSON."""
+    case_data = LLMOperations()._build_case_data(_legal_case(court_claim_number="K00CL123"))
+    assert case_data["case_reference"] == "TEST001"
+    assert case_data["case_title"] == "Smith v Jones"
+    assert case_data["court"] == "K00CL123"
+    assert orjson.loads(case_data["work_items"]) == [{
+        "date_of_work": "2024-01-02",
+        "description": "Initial client meeting",
+        "time_spent_units": 10,
+        "claimed_amount_gbp": 350.0
+    }]
+    assert orjson.loads(case_data["disbursements"]) == [{
+        "date_incurred": "2024-01-03",
+        "description": "Issue fee",
+        "amount_net_gbp": 455.0,
+        "vat_gbp": 0.0,
+        "amount_gross_gbp": None
+    }]
+
+def test_build_case_data_without_court():
+    case_data = LLMOperations()._build_case_data(_legal_case(work_items=[], disbursements=[]))
+    assert case_data["court"] == "Not specified"
+    assert case_data["work_items"] == "[]"
+    assert case_data["disbursements"] == "[]"
+
+def test_prompts_render_with_case_data():
+    """Every document prompt finds all of its placeholders in the case data."""
+    case_data = LLMOperations()._build_case_data(_legal_case())
+    for prompt in _PROMPTS.values():
+        rendered = prompt.render(case_data)
+        assert "TEST001" in rendered
+        assert "Smith v Jones" in rendered
@@ -0,0 +1,139 @@
+import random
+from datetime import date, timedelta
+import uuid
+
+import numpy as np
+import pytest
+
+from src.models.domain import (
+    BillItem, WorkItem, Disbursement, WorkActivityType, DisbursementType
+)
+from src.models.columnar import (
+    WorkItemTable, DisbursementTable, NO_DATE, to_date, to_epoch_day
+)
+from src.models.totals import sum_recoverable
+
+_START = date(2024, 1, 1)
+
+def _work_items(count, seed=0):
+    rng = random.Random(seed)
+    case_id = uuid.uuid4()
+    items = []
+    for i in range(count):
+        units = rng.randint(1, 60)
+        rate = rng.choice([113.0, 181.0, 218.0, 261.5, 350.0])
+        items.append(WorkItem(
+            case_id=case_id,
+            fee_earner_id=uuid.uuid4(),
+            date_of_work=_START + timedelta(days=i % 365),
+            activity_type=rng.choice(list(WorkActivityType)),
+            description=f"Work item {i}",
+            time_spent_units=units,
+            time_spent_decimal_hours=units / 10,
+            applicable_hourly_rate_gbp=rate,
+            # Leave some unclaimed so the hours x rate fallback is exercised
+            claimed_amount_gbp=round(rng.uniform(1, 5000), 2) if i % 3 else None,
+            is_recoverable=rng.random() > 0.2
+        ))
+    return items
+
+def _disbursements(count, seed=0):
+    rng = random.Random(seed)
+    case_id = uuid.uuid4()
+    items = []
+    for i in range(count):
+        net = round(rng.uniform(1, 2000), 2)
+        vat = round(net * 0.2, 2)
+        items.append(Disbursement(
+            case_id=case_id,
+            date_incurred=_START + timedelta(days=i % 365),
+            disbursement_type=rng.choice(list(DisbursementType)),
+            description=f"Disbursement {i}",
+            amount_net_gbp=net,
+            vat_gbp=vat,
+            # Leave some without a gross amount so net + VAT is exercised
+            amount_gross_gbp=round(net + vat, 2) if i % 2 else None,
+            is_recoverable=rng.random() > 0.2
+        ))
+    return items
+
+def _work_item_pence(item):
+    """Per-item amount as the bill generator computed it before the columnar tables."""
+    amount = item.claimed_amount_gbp or (item.time_spent_decimal_hours * item.applicable_hourly_rate_gbp)
+    return BillItem(date=item.date_of_work, description=item.description, amount=amount).amount_pence
+
+def _disbursement_pence(item):
+    amount = item.amount_gross_gbp or (item.amount_net_gbp + item.vat_gbp)
+    return BillItem(date=item.date_incurred, description=item.description, amount=amount).amount_pence
+
+@pytest.mark.parametrize("count", [0, 1, 1000])
+def test_work_item_totals_match_per_item_computation(count):
+    """Columnar totals equal the sum of per-item pence amounts."""
+    items = _work_items(count)
+    table = WorkItemTable.from_work_items(items)
+    assert table.total_pence() == sum(_work_item_pence(item) for item in items)
+    assert table.recoverable_pence() == sum(_work_item_pence(item) for item in items if item.is_recoverable)
+
+@pytest.mark.parametrize("count", [0, 1, 1000])
+def test_disbursement_totals_match_per_item_computation(count):
+    """Columnar totals equal the sum of per-item pence amounts."""
+    items = _disbursements(count)
+    table = DisbursementTable.from_disbursements(items)
+    assert table.total_pence() == sum(_disbursement_pence(item) for item in items)
+    assert table.recoverable_pence() == sum(_disbursement_pence(item) for item in items if item.is_recoverable)
+
+def test_totals_match_float_sum():
+    """Pence totals agree with the old float sum to within a penny per item."""
+    items = _work_items(1000, seed=1)
+    table = WorkItemTable.from_work_items(items)
+    float_total = sum(
+        item.claimed_amount_gbp or (item.time_spent_decimal_hours * item.applicable_hourly_rate_gbp)
+        for item in items
+    )
+    assert abs(table.total_pence() / 100 - float_total) <= len(items) * 0.005
+
+def test_from_records_matches_from_models():
+    """Dict rows (e.g. from Neo4j) build the same columns as the models."""
+    items = _work_items(50, seed=2)
+    from_models = WorkItemTable.from_work_items(items)
+    from_records = WorkItemTable.from_records([item.model_dump() for item in items])
+    np.testing.assert_array_equal(from_models.amount_pence, from_records.amount_pence)
+    np.testing.assert_array_equal(from_models.is_recoverable, from_records.is_recoverable)
+    np.testing.assert_array_equal(from_models.activity_type, from_records.activity_type)
+    np.testing.assert_array_equal(from_models.date_of_work, from_records.date_of_work)
+
+def test_sum_recoverable():
+    """Only flagged amounts are summed."""
+    amount = np.array([100, 250, 5, 1000], dtype=np.int64)
+    recoverable = np.array([True, False, True, False])
+    assert sum_recoverable(amount, recoverable) == 105
+    assert sum_recoverable(amount[:0], recoverable[:0]) == 0
+
+def test_missing_dates_use_sentinel():
+    """A missing date is NO_DATE, not 1970-01-01, and never falls in a period."""
+    records = [
+        {"claimed_amount_gbp": 100.0, "date_of_work": date(2024, 1, 2)},
+        {"claimed_amount_gbp": 50.0, "date_of_work": None},
+        {"claimed_amount_gbp": 25.0, "date_of_work": date(1970, 1, 1)},
+    ]
+    table = WorkItemTable.from_records(records)
+    assert table.date_of_work.tolist() == [to_epoch_day(date(2024, 1, 2)), NO_DATE, 0]
+    assert table.has_date().tolist() == [True, False, True]
+    assert table.in_period(date(1900, 1, 1), date(2100, 1, 1)).tolist() == [True, False, True]
+    assert table.in_period(date(2024, 1, 1), date(2024, 1, 31)).tolist() == [True, False, False]
+    assert table.total_pence() == 17500
+
+def test_disbursement_missing_dates_use_sentinel():
+    """Disbursements encode a missing date the same way."""
+    table = DisbursementTable.from_records([
+        {"amount_net_gbp": 10.0, "vat_gbp": 2.0, "date_incurred": None},
+        {"amount_gross_gbp": 30.0, "date_incurred": date(2024, 3, 1)},
+    ])
+    assert table.has_date().tolist() == [False, True]
+    assert table.total_pence() == 4200
+
+def test_epoch_day_round_trip():
+    """to_date inverts to_epoch_day and decodes NO_DATE as None."""
+    for value in (date(1970, 1, 1), date(1969, 12, 31), date(2024, 2, 29), date(2099, 12, 31)):
+        assert to_date(to_epoch_day(value)) == value
+    assert to_date(NO_DATE) is None
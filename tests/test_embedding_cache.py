@@ -0,0 +1,93 @@
+import pytest
+
+from src.llm.embedding_cache import EmbeddingCache, text_hash, _MAX_QUERY_PARAMS
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache" / "embeddings.sqlite"))
+    yield cache
+    cache.close()
+
+def test_text_hash_is_stable():
+    """Keys are the sha256 hex digest of the UTF-8 text."""
+    assert text_hash("hello") == "2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824"
+    assert text_hash("costs") == text_hash("costs")
+    assert text_hash("costs") != text_hash("Costs")
+
+def test_round_trip(cache):
+    """Stored vectors come back to float32 precision."""
+    vectors = {text_hash("a"): [0.1, -0.25, 3.0], text_hash("b"): [1e-3, 2.5, -7.125]}
+    cache.put_many(vectors.items(), "nomic-embed-text")
+    found = cache.get_many(vectors, "nomic-embed-text")
+    assert found.keys() == vectors.keys()
+    for key, vec in vectors.items():
+        assert found[key] == pytest.approx(vec, rel=1e-6)
+
+def test_misses_are_omitted(cache):
+    cache.put_many([(text_hash("a"), [1.0])], "m")
+    found = cache.get_many([text_hash("a"), text_hash("missing")], "m")
+    assert list(found) == [text_hash("a")]
+    assert cache.get_many([], "m") == {}
+
+def test_models_are_kept_apart(cache):
+    """The same text cached under two models keeps both vectors."""
+    key = text_hash("a")
+    cache.put_many([(key, [1.0, 2.0])], "model-a")
+    cache.put_many([(key, [3.0, 4.0])], "model-b")
+    assert cache.get_many([key], "model-a")[key] == [1.0, 2.0]
+    assert cache.get_many([key], "model-b")[key] == [3.0, 4.0]
+    assert cache.get_many([key], "model-c") == {}
+
+def test_put_replaces_existing(cache):
+    key = text_hash("a")
+    cache.put_many([(key, [1.0])], "m")
+    cache.put_many([(key, [2.0])], "m")
+    assert cache.get_many([key], "m")[key] == [2.0]
+
+def test_lookup_batches_past_parameter_limit(cache):
+    """More keys than one statement can bind are split across queries."""
+    count = _MAX_QUERY_PARAMS * 2 + 17
+    items = [(text_hash(str(i)), [float(i)]) for i in range(count)]
+    cache.put_many(items, "m")
+    # Duplicates in the request are looked up once
+    found = cache.get_many([key for key, _ in items] + [items[0][0]], "m")
+    assert len(found) == count
+    assert found[text_hash("42")] == [42.0]
+
+def test_persists_across_connections(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    first = EmbeddingCache(path)
+    first.put_many([(text_hash("a"), [0.5])], "m")
+    first.close()
+    second = EmbeddingCache(path)
+    assert second.get_many([text_hash("a")], "m") == {text_hash("a"): [0.5]}
+    second.close()
+
+def test_query_embeddings_are_memoized(tmp_path, monkeypatch):
+    """A repeated query is served in-process, then from the persistent cache after clearing."""
+    operations = pytest.importorskip("src.llm.operations")
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    monkeypatch.setattr(operations, "get_embedding_cache", lambda: cache)
+    calls = []
+
+    def fake_embed_query(self, text):
+        calls.append(text)
+        return [0.25, 0.5]
+
+    monkeypatch.setattr(operations._BatchOllamaEmbeddings, "embed_query", fake_embed_query)
+    operations.clear_embedding_cache()
+    try:
+        first = operations._cached_embed_query("m", "http://localhost:11434", "costs query")
+        second = operations._cached_embed_query("m", "http://localhost:11434", "costs query")
+        assert first == second == (0.25, 0.5)
+        assert calls == ["costs query"]
+        # Query vectors are stored apart from document vectors for the same model
+        assert cache.get_many([text_hash("costs query")], "m") == {}
+        assert text_hash("costs query") in cache.get_many([text_hash("costs query")], "m#query")
+
+        operations.clear_embedding_cache()
+        assert operations._cached_embed_query("m", "http://localhost:11434", "costs query") == (0.25, 0.5)
+        assert calls == ["costs query"]
+    finally:
+        operations.clear_embedding_cache()
+        cache.close()
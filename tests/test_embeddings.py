@@ -0,0 +1,28 @@
+import math
+import random
+
+import pytest
+
+from src.models.domain import normalize_embedding
+
+def _random_embedding(dim=768, seed=0):
+    rng = random.Random(seed)
+    return [rng.gauss(0, 1) for _ in range(dim)]
+
+def test_normalize_embedding_unit_length():
+    normalized = normalize_embedding(_random_embedding())
+    assert math.sqrt(sum(value * value for value in normalized)) == pytest.approx(1.0)
+    assert normalize_embedding([3.0, 4.0]) == pytest.approx([0.6, 0.8])
+
+def test_normalize_keeps_direction():
+    """Cosine similarity is unchanged by normalizing, so the index ranks chunks the same."""
+    a, b = _random_embedding(seed=1), _random_embedding(seed=2)
+
+    def cosine(x, y):
+        dot = sum(p * q for p, q in zip(x, y))
+        return dot / math.sqrt(sum(p * p for p in x) * sum(q * q for q in y))
+
+    assert cosine(normalize_embedding(a), normalize_embedding(b)) == pytest.approx(cosine(a, b))
+
+def test_normalize_zero_vector_unchanged():
+    assert normalize_embedding([0.0, 0.0]) == [0.0, 0.0]
@@ -0,0 +1,40 @@
+import threading
+import uuid
+
+from src.models.fastuuid import fast_uuid4, _POOL_SIZE
+
+def test_fast_uuid4_is_version_4():
+    """Every UUID carries the version 4 and RFC 4122 variant bits."""
+    for _ in range(1000):
+        value = fast_uuid4()
+        assert isinstance(value, uuid.UUID)
+        assert value.version == 4
+        assert value.variant == uuid.RFC_4122
+
+def test_fast_uuid4_unique_across_pool_refills():
+    """UUIDs stay unique when the byte pool is refilled several times."""
+    count = (_POOL_SIZE // 16) * 4 + 7
+    values = {fast_uuid4() for _ in range(count)}
+    assert len(values) == count
+
+def test_fast_uuid4_unique_across_threads():
+    """Each thread draws from its own pool, so threads never share UUIDs."""
+    results = []
+    lock = threading.Lock()
+
+    def draw():
+        values = [fast_uuid4() for _ in range(500)]
+        with lock:
+            results.extend(values)
+
+    threads = [threading.Thread(target=draw) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == len(results) == 4000
+
+def test_fast_uuid4_round_trips_through_str():
+    """The value survives the string form used for Neo4j properties."""
+    value = fast_uuid4()
+    assert uuid.UUID(str(value)) == value
@@ -0,0 +1,64 @@
+import uuid
+
+from src.graph.operations import _TTLCache, _cached_read
+from src.models.domain import Party, PartyRole
+
+class _FakeGraph:
+    """Stands in for Neo4jGraph: counts lookups instead of querying Neo4j."""
+
+    def __init__(self, ttl=30.0):
+        self._read_cache = _TTLCache(ttl=ttl)
+        self.calls = []
+
+    @_cached_read
+    def find_party(self, name, role=PartyRole.CLAIMANT):
+        self.calls.append((name, role))
+        if name == "missing":
+            return None
+        return Party(case_id=uuid.UUID(int=1001), name=name, role=role)
+
+def test_positional_reads_are_cached():
+    graph = _FakeGraph()
+    assert graph.find_party("Smith").name == "Smith"
+    assert graph.find_party("Smith").name == "Smith"
+    assert graph.calls == [("Smith", PartyRole.CLAIMANT)]
+
+def test_keyword_reads_are_cached_by_value():
+    """Keyword calls work and their arguments are part of the key."""
+    graph = _FakeGraph()
+    assert graph.find_party(name="Smith").name == "Smith"
+    assert graph.find_party(name="Smith").name == "Smith"
+    assert graph.find_party(name="Smith", role=PartyRole.DEFENDANT).role == PartyRole.DEFENDANT
+    assert graph.find_party(role=PartyRole.DEFENDANT, name="Smith").role == PartyRole.DEFENDANT
+    assert graph.calls == [("Smith", PartyRole.CLAIMANT), ("Smith", PartyRole.DEFENDANT)]
+
+def test_empty_results_are_not_cached():
+    graph = _FakeGraph()
+    assert graph.find_party("missing") is None
+    assert graph.find_party("missing") is None
+    assert len(graph.calls) == 2
+
+def test_callers_get_copies():
+    """Mutating a returned model does not change what later callers see."""
+    graph = _FakeGraph()
+    first = graph.find_party("Smith")
+    first.name = "Changed"
+    assert graph.find_party("Smith").name == "Smith"
+
+def test_entries_expire():
+    graph = _FakeGraph(ttl=-1.0)
+    graph.find_party("Smith")
+    graph.find_party("Smith")
+    assert len(graph.calls) == 2
+
+def test_lru_eviction():
+    cache = _TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    cache.clear()
+    assert cache.get("a") is None
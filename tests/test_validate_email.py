@@ -0,0 +1,59 @@
+import pytest
+
+from src.models import domain
+from src.models.domain import validate_email, _EMAIL_RE
+
+VALID_EMAILS = [
+    "john.smith@example.com",
+    "a@b.co",
+    "first+tag@sub.domain.org",
+    "under_score%percent-dash@host-name.uk",
+    "UPPER@EXAMPLE.COM",
+    "x@1.2.3.example.io",
+    "dots..in.local@host.com",
+    "trailing.@host.com",
+    "user@-host.com",
+    "user@host..com",
+]
+
+INVALID_EMAILS = [
+    "",
+    "plainaddress",
+    "@example.com",
+    "user@",
+    "user@host",
+    "user@.com",
+    "user@host.c",
+    "user@host.c0m",
+    "user@host.com.",
+    "two@@host.com",
+    "a@b@c.com",
+    "space in@host.com",
+    "user@ho st.com",
+    "user@host_name.com",
+    "user!@host.com",
+    "usér@host.com",
+    "user@host.cöm",
+    "user@host.com\n",
+]
+
+@pytest.mark.parametrize("email", VALID_EMAILS + INVALID_EMAILS)
+def test_validate_email_matches_regex(email):
+    """The manual scan accepts exactly the strings EMAIL_PATTERN matches in full."""
+    # fullmatch, since re's `$` also matches before a trailing newline
+    assert validate_email(email) == (_EMAIL_RE.fullmatch(email) is not None)
+
+@pytest.mark.parametrize("email", VALID_EMAILS + INVALID_EMAILS)
+def test_regex_fallback_matches_scan(email, monkeypatch):
+    """USE_REGEX_EMAIL_VALIDATION gives the same answers as the manual scan."""
+    expected = validate_email(email)
+    monkeypatch.setattr(domain, "USE_REGEX_EMAIL_VALIDATION", True)
+    assert validate_email(email) == expected
+
+@pytest.mark.parametrize("email", VALID_EMAILS)
+def test_validate_email_accepts(email):
+    assert validate_email(email)
+
+@pytest.mark.parametrize("email", INVALID_EMAILS)
+def test_validate_email_rejects(email):
+    assert not validate_email(email)